@@ -2,8 +2,10 @@
 
 # Import the Chatbot class that defines the Streamlit application interface
 from application.chatbot import Chatbot
+from configs.config import Config
 
 # Check if this script is being run as the main program
 if __name__ == "__main__":
-    # Instantiate and launch the Streamlit chatbot dashboard
+    # Create the data directories, then launch the Streamlit chatbot dashboard
+    Config.paths.ensure()
     Chatbot().run()
@@ -1,32 +1,114 @@
+from __future__ import annotations
+
+import asyncio
 import logging
+import os
+import re
+import threading
+from typing import TYPE_CHECKING, TypeVar
 
 import streamlit as st
-from langchain.memory import ConversationBufferMemory
+from dotenv import load_dotenv
+from langchain.memory import ConversationSummaryBufferMemory
 from langchain.schema import AIMessage, HumanMessage
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from configs.config import Config
+
+# Heavy modules (torch, FAISS, OCR, matplotlib) are imported where they are used
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from langchain_huggingface import ChatHuggingFace
+    from streamlit.runtime.scriptrunner import ScriptRunContext
 
-from src.agents.qa_agent import QAAgent
-from src.handlers.ocr_handler import download_and_process_images
-from src.handlers.pdf_handler import download_and_process_pdfs
-from src.handlers.visualizer_handler import (
-    visualize_sales_vs_stock_correlation,
-    visualize_stock_vs_index,
-    visualize_vehicles_sold_per_year,
-)
-from src.handlers.youtube_handler import download_and_process_youtube_contents
+    from src.agents.qa_agent import QAAgent
+
+T = TypeVar("T")
 
 # Suppress verbose logs
 logging.getLogger("pdfminer").setLevel(logging.ERROR)
 
+# Load environment variables
+load_dotenv()
+
+
+# Visualization handlers, importing the plotting stack only when a chart is requested
+def _visualize_vehicles_sold_per_year() -> None:
+    """Plot vehicles sold per year in the Streamlit page."""
+    from src.handlers.visualizer_handler import visualize_vehicles_sold_per_year
+
+    visualize_vehicles_sold_per_year(streamlit=True)
+
+
+def _visualize_stock_vs_index() -> None:
+    """Plot Renault's stock vs the CAC40 index in the Streamlit page."""
+    from src.handlers.visualizer_handler import visualize_stock_vs_index
+
+    visualize_stock_vs_index(streamlit=True)
+
+
+def _visualize_sales_vs_stock_correlation() -> None:
+    """Plot the sales vs stock price correlation in the Streamlit page."""
+    from src.handlers.visualizer_handler import visualize_sales_vs_stock_correlation
+
+    visualize_sales_vs_stock_correlation(streamlit=True)
+
+
+# Visualization intents, checked in order: (pattern, handler, progress message, reply)
+INTENT_TABLE: list[tuple[re.Pattern[str], Callable[[], None], str, str]] = [
+    (
+        re.compile(r"vehicles sold per year", re.IGNORECASE),
+        _visualize_vehicles_sold_per_year,
+        "Generating graph: vehicles sold per year...",
+        "📊 Generated graph: vehicles sold per year.",
+    ),
+    (
+        re.compile(r"^(?=.*stock price)(?=.*cac40)", re.IGNORECASE | re.DOTALL),
+        _visualize_stock_vs_index,
+        "Generating graph: stock vs CAC40...",
+        "📊 Compared Renault stock vs CAC40.",
+    ),
+    (
+        re.compile(r"^(?=.*correlation)(?=.*sales)(?=.*stock)", re.IGNORECASE | re.DOTALL),
+        _visualize_sales_vs_stock_correlation,
+        "Generating graph: sales vs stock correlation...",
+        "📊 Analyzed correlation between sales and stock.",
+    ),
+]
+
+
+@st.cache_resource(show_spinner="Loading QA system...")
+def get_qa_agent() -> QAAgent:
+    """Load the QA agent (embedding model and FAISS indexes) once per process."""
+    from src.agents.qa_agent import QAAgent
+
+    return QAAgent()
+
+
+def _approx_token_ids(text: str) -> list[int]:
+    """Stand-in token ids (about 4 characters per token), so memory pruning does not download GPT-2's tokenizer."""
+    return [0] * -(-len(text) // 4)
+
+
+@st.cache_resource(show_spinner=False)
+def get_memory_llm() -> ChatHuggingFace:
+    """Build the chat model used to summarize older conversation turns, once per process."""
+    # langchain_huggingface pulls in torch and transformers; keep it off the module import path
+    from langchain_huggingface import ChatHuggingFace, HuggingFaceEndpoint
+
+    endpoint = HuggingFaceEndpoint(
+        repo_id=Config.models.LLM_NAME,
+        max_new_tokens=Config.models.LLM_MAX_TOKENS,
+        temperature=Config.models.LLM_TEMPERATURE,
+        huggingfacehub_api_token=os.getenv("HUGGINGFACE_TOKEN"),
+    )
+    return ChatHuggingFace(llm=endpoint, custom_get_token_ids=_approx_token_ids)
+
 
 class Chatbot:
     """A Streamlit chatbot for document QA and visualization."""
 
-    def __init__(self) -> None:
-        """Initialize the Chatbot with optional memory and QA agent."""
-        self.qa_agent: QAAgent | None = None
-        if "memory" not in st.session_state:
-            st.session_state.memory = ConversationBufferMemory(return_messages=True)
-
     # ---------------------------------------
     # PAGE 1: HOME — Upload, Process & Ask
     # ---------------------------------------
@@ -38,8 +120,12 @@ class Chatbot:
 
         if st.button("🚀 Process"):
             if uploaded_files:
-                for file in uploaded_files:
-                    self._process_uploaded_file(file)
+                processed = asyncio.run(self._aprocess_uploaded_files(uploaded_files))
+                # Memory and cached agent are only touched from the script thread
+                for file_name, file_type in processed:
+                    self._log_file_message(file_name, file_type)
+                if processed:
+                    self._reset_qa_agent()
             elif yt_url.strip():
                 self._process_youtube_url(yt_url)
             else:
@@ -76,34 +162,77 @@ class Chatbot:
         """Display YouTube URL input widget."""
         return st.text_input("🎥 Or enter a YouTube video URL:")
 
-    def _process_uploaded_file(self, uploaded_file: object) -> None:
-        """Process a single uploaded PDF or image."""
+    async def _aprocess_uploaded_files(self, uploaded_files: list) -> list[tuple[str, str]]:
+        """Process all uploaded files concurrently, returning the (name, type) of each file processed."""
+        ctx = get_script_run_ctx()
+
+        # PDFs run one per worker thread; images share a single OCR batch
+        image_files = [file for file in uploaded_files if self._is_image(file)]
+        tasks = [self._aprocess_uploaded_file(file, ctx) for file in uploaded_files if not self._is_image(file)]
+        if image_files:
+            tasks.append(asyncio.to_thread(self._run_in_script_context, ctx, self._process_uploaded_images, image_files))
+
+        results = await asyncio.gather(*tasks)
+        return [processed for file_results in results for processed in file_results]
+
+    async def _aprocess_uploaded_file(self, uploaded_file: object, ctx: ScriptRunContext | None) -> list[tuple[str, str]]:
+        """Process a single uploaded PDF on a worker thread."""
+        return await asyncio.to_thread(self._run_in_script_context, ctx, self._process_uploaded_file, uploaded_file)
+
+    @staticmethod
+    def _run_in_script_context(ctx: ScriptRunContext | None, func: Callable[..., T], *args: object) -> T:
+        """Run `func` on the current worker thread with the Streamlit script context attached, so it can render messages."""
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return func(*args)
+
+    def _process_uploaded_file(self, uploaded_file: object) -> list[tuple[str, str]]:
+        """Process a single uploaded PDF, returning its (name, type) if it was processed. Images go through `_process_uploaded_images`."""
         file_type = uploaded_file.type.lower()
         file_name = uploaded_file.name
         st.info(f"📄 Detected file: {file_name} ({file_type})")
 
         try:
             if "pdf" in file_type:
+                from src.handlers.pdf_handler import download_and_process_pdfs
+
                 st.info(f"Processing {file_name} as PDF...")
                 download_and_process_pdfs(pdf_file=uploaded_file)
                 st.success(f"✅ {file_name} processed successfully (PDF).")
-                self._log_file_message(file_name, "PDF")
-            elif any(ext in file_type for ext in ["image", "png", "jpg", "jpeg", "tiff"]):
-                st.info(f"Processing {file_name} as image...")
-                download_and_process_images(image_file=uploaded_file)
-                st.success(f"✅ {file_name} processed successfully (image OCR).")
-                self._log_file_message(file_name, "image")
-            else:
-                st.warning(f"⚠️ Unsupported file type: {file_name}")
+                return [(file_name, "PDF")]
+            st.warning(f"⚠️ Unsupported file type: {file_name}")
         except (FileNotFoundError, ValueError) as e:
             st.error(f"❌ Error processing {file_name}: {e}")
+        return []
+
+    def _process_uploaded_images(self, image_files: list) -> list[tuple[str, str]]:
+        """Process several uploaded images as a single OCR batch, returning the (name, type) of each image processed."""
+        from src.handlers.ocr_handler import download_and_process_image_batch
+
+        file_names = [file.name for file in image_files]
+        st.info(f"Processing {len(image_files)} image(s) as one OCR batch...")
+        try:
+            download_and_process_image_batch(image_files=image_files)
+            st.success(f"✅ {len(image_files)} image(s) processed successfully (image OCR).")
+            return [(file_name, "image") for file_name in file_names]
+        except (FileNotFoundError, ValueError) as e:
+            st.error(f"❌ Error processing images {', '.join(file_names)}: {e}")
+        return []
+
+    @staticmethod
+    def _is_image(uploaded_file: object) -> bool:
+        """Return whether an uploaded file is an image, based on its MIME type."""
+        file_type = uploaded_file.type.lower()
+        return any(ext in file_type for ext in ["image", "png", "jpg", "jpeg", "tiff"])
 
     def _process_youtube_url(self, yt_url: str) -> None:
         """Process a YouTube video URL."""
+        from src.handlers.youtube_handler import download_and_process_youtube_contents
+
         try:
             st.info("🎬 Processing YouTube video...")
             download_and_process_youtube_contents(yt_url=yt_url)
             st.success("✅ YouTube video processed and indexed.")
+            self._reset_qa_agent()
             self._log_file_message(yt_url, "YouTube URL")
         except (FileNotFoundError, ValueError) as e:
             st.error(f"❌ Error processing YouTube video: {e}")
@@ -114,43 +243,70 @@ class Chatbot:
         st.subheader("❓ Ask a Question")
         return st.text_input("💬 Ask a question:")
 
-    def _handle_question(self, question: str) -> str:
-        """Answer a user question, possibly generating visualizations."""
-        q_lower = question.lower()
-
-        if "vehicles sold per year" in q_lower:
-            st.info("Generating graph: vehicles sold per year...")
-            visualize_vehicles_sold_per_year(streamlit=True)
-            return "📊 Generated graph: vehicles sold per year."
-
-        if "stock price" in q_lower and "cac40" in q_lower:
-            st.info("Generating graph: stock vs CAC40...")
-            visualize_stock_vs_index(streamlit=True)
-            return "📊 Compared Renault stock vs CAC40."
-
-        if "correlation" in q_lower and "sales" in q_lower and "stock" in q_lower:
-            st.info("Generating graph: sales vs stock correlation...")
-            visualize_sales_vs_stock_correlation(streamlit=True)
-            return "📊 Analyzed correlation between sales and stock."
-
-        if self.qa_agent is None:
-            try:
-                self.qa_agent = QAAgent()
-            except FileNotFoundError as e:
-                st.error(f"❌ Error loading QA system: {e}")
-                return "Error loading QA system."
-        return self.qa_agent.answer_question(question)
+    def _handle_question(self, question: str) -> str | Iterator[str]:
+        """Answer a user question, possibly generating visualizations. LLM answers are returned as a token stream."""
+        for pattern, visualize, progress_msg, reply in INTENT_TABLE:
+            if pattern.search(question):
+                st.info(progress_msg)
+                visualize()
+                return reply
+
+        # Always go through the process-wide cache, so every session sees an agent reset by any upload
+        try:
+            qa_agent = get_qa_agent()
+        except (FileNotFoundError, ValueError) as e:
+            st.error(f"❌ Error loading QA system: {e}")
+            return "Error loading QA system."
+        return qa_agent.answer_question_stream(question)
+
+    def _reset_qa_agent(self) -> None:
+        """Drop the cached QA agent so newly indexed content is picked up on the next question, in every session."""
+        get_qa_agent.clear()
+
+    @staticmethod
+    def _get_memory() -> ConversationSummaryBufferMemory:
+        """Return the session's conversation memory, creating it (and the summary LLM) on the first write."""
+        if "memory" not in st.session_state:
+            st.session_state.memory = ConversationSummaryBufferMemory(
+                llm=get_memory_llm(),
+                max_token_limit=Config.models.LLM_MAX_TOKENS,
+                return_messages=True,
+            )
+        return st.session_state.memory
+
+    def _remember(self, question: str, answer: str) -> None:
+        """Add a turn to conversation memory, summarizing older turns once the buffer is over its token limit.
+
+        Summarizing calls the remote LLM; if that fails, the raw buffer is kept instead of raising.
+        """
+        memory = self._get_memory()
+        memory.chat_memory.add_message(HumanMessage(content=question))
+        memory.chat_memory.add_message(AIMessage(content=answer))
+
+        # prune() pops the oldest messages before summarizing them, so restore them on failure
+        messages = list(memory.chat_memory.messages)
+        try:
+            memory.prune()
+        except Exception as exc:
+            memory.chat_memory.messages = messages
+            print(f"Could not summarize older conversation turns, keeping them as is: {exc}")
 
     def _log_file_message(self, name: str, type_: str) -> None:
         """Log file upload or processing to conversation memory."""
-        st.session_state.memory.chat_memory.add_message(HumanMessage(content=f"Uploaded {type_}: {name}"))
-        st.session_state.memory.chat_memory.add_message(AIMessage(content=f"Processed {name} as {type_}."))
+        self._remember(f"Uploaded {type_}: {name}", f"Processed {name} as {type_}.")
+
+    def _log_and_display_answer(self, question: str, ai_answer: str | Iterator[str]) -> None:
+        """Display the answer, streaming it as it is generated when possible, then log question and answer."""
+        if isinstance(ai_answer, str):
+            st.success(f"🧠 Answer: {ai_answer}")
+        else:
+            from src.agents.qa_agent import ANSWER_MARKER
+
+            st.markdown("🧠 **Answer:**")
+            # Log only the text after an echoed prompt, like `QAAgent.answer_question` returns
+            ai_answer = st.write_stream(ai_answer).split(ANSWER_MARKER)[-1].strip()
 
-    def _log_and_display_answer(self, question: str, ai_answer: str) -> None:
-        """Log question and answer, then display the answer."""
-        st.session_state.memory.chat_memory.add_message(HumanMessage(content=question))
-        st.session_state.memory.chat_memory.add_message(AIMessage(content=ai_answer))
-        st.success(f"🧠 Answer: {ai_answer}")
+        self._remember(question, ai_answer)
 
     # ---------------------------------------
     # PAGE 2: CONVERSATION HISTORY
@@ -158,11 +314,15 @@ class Chatbot:
     def show_history(self) -> None:
         """Display conversation history."""
         st.markdown("<h1 style='text-align: center;'>📝 Conversation History</h1>", unsafe_allow_html=True)
-        messages = st.session_state.memory.chat_memory.messages
-        if not messages:
+        # Memory is only created once something is logged
+        memory = st.session_state.get("memory")
+        if memory is None or (not memory.chat_memory.messages and not memory.moving_summary_buffer):
             st.info("No conversation history yet.")
             return
-        for msg in messages:
+        if memory.moving_summary_buffer:
+            # Older turns are condensed once the buffer exceeds its token limit
+            st.markdown(f"**📜 Earlier conversation (summary):** {memory.moving_summary_buffer}")
+        for msg in memory.chat_memory.messages:
             role = "🧑 User" if isinstance(msg, HumanMessage) else "🤖 AI"
             st.markdown(f"**{role}:** {msg.content}")
 
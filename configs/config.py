@@ -1,15 +1,15 @@
 """Agentic AI System configuration."""
 
+import re
+from functools import cache
 from pathlib import Path
 from typing import ClassVar
 
-import torch
-
 
 class PathConfig:
     """File and directory path configuration for input/output data.
 
-    Automatically creates necessary directories if they don't exist.
+    Directories are created on demand via `ensure()` rather than at import time.
     """
 
     # Base project directory
@@ -35,38 +35,69 @@ class PathConfig:
     ANNOUNCEMENT_DATE_FILE_NAME: ClassVar[str] = "announcement_result_dates.csv"
     VEHICLE_SOLD_FILE_NAME: ClassVar[str] = "vehicles_sold_per_year.csv"
 
-    # Ensure directories exist on first import
-    DATA_DIR.mkdir(exist_ok=True)
-    MODEL_DIR.mkdir(exist_ok=True)
-    INDEX_DIR.mkdir(exist_ok=True)
-    PDF_DIR.mkdir(exist_ok=True, parents=True)
-    IMAGE_DIR.mkdir(exist_ok=True, parents=True)
-    TXT_FROM_IMAGE_DIR.mkdir(exist_ok=True, parents=True)
-    TABLE_DIR.mkdir(exist_ok=True, parents=True)
-    YOUTUBE_DIR.mkdir(exist_ok=True, parents=True)
-    FINANCIAL_DIR.mkdir(exist_ok=True, parents=True)
-    GRAPH_DIR.mkdir(parents=True, exist_ok=True)
+    # FAISS index combining every per-file index, kept up to date on each upload. Per-file indexes are
+    # named "index_faiss_<file stem>", so this name must not start with "index_faiss_" (e.g. for "all.pdf")
+    MERGED_INDEX_NAME: ClassVar[str] = "merged_index"
+
+    @classmethod
+    def ensure(cls: type["PathConfig"]) -> None:
+        """Create all data directories if they don't exist. Call once from application entry points."""
+        for directory in (
+            cls.DATA_DIR,
+            cls.MODEL_DIR,
+            cls.INDEX_DIR,
+            cls.PDF_DIR,
+            cls.IMAGE_DIR,
+            cls.TXT_FROM_IMAGE_DIR,
+            cls.TABLE_DIR,
+            cls.YOUTUBE_DIR,
+            cls.FINANCIAL_DIR,
+            cls.GRAPH_DIR,
+        ):
+            directory.mkdir(parents=True, exist_ok=True)
 
 
 class ModelConfig:
     """Configuration for embedding models and language models (LLMs)."""
 
-    device: ClassVar[str] = "cuda" if torch.cuda.is_available() else "cpu"
     EMBEDDING_MODEL_NAME: ClassVar[str] = "sentence-transformers/all-MiniLM-L6-v2"
-    EMBEDDING_MODEL_KWARGS: ClassVar[dict[str, str]] = {"device": device}
+    # Larger encode batches, normalized for cosine similarity via inner-product search
+    EMBEDDING_ENCODE_KWARGS: ClassVar[dict[str, int | bool]] = {"batch_size": 64, "normalize_embeddings": True}
+    # Use int8 dynamic quantization for the query encoder when running on CPU
+    EMBEDDING_QUANTIZE_ON_CPU: ClassVar[bool] = True
 
     LLM_NAME: ClassVar[str] = "HuggingFaceTB/SmolLM3-3B"
     LLM_MAX_TOKENS: ClassVar[int] = 500
     LLM_TEMPERATURE: ClassVar[float] = 0.6
     LLM_SAMPLE: ClassVar[bool] = False
 
+    @staticmethod
+    @cache
+    def get_device() -> str:
+        """Return the torch device models run on, importing torch only on the first call."""
+        import torch
+
+        return "cuda" if torch.cuda.is_available() else "cpu"
+
+    @classmethod
+    def get_embedding_model_kwargs(cls: type["ModelConfig"]) -> dict[str, str]:
+        """Return the keyword arguments used to load the embedding model."""
+        return {"device": cls.get_device()}
+
 
 class ProcessingConfig:
     """Chunking and retrieval settings used during document processing."""
 
     CHUNK_SIZE: ClassVar[int] = 1000
     CHUNK_OVERLAP: ClassVar[int] = 100
+    # Texts at least this long are cut into fixed-size overlapping windows (fast, but mid-word) instead of
+    # with LangChain's separator-aware recursive splitter
+    WINDOW_SPLITTING_MIN_CHARS: ClassVar[int] = 1_000_000
     RETRIEVER_K: ClassVar[int] = 5
+    # HNSW graph parameters for the FAISS indexes (higher = better recall, slower)
+    HNSW_M: ClassVar[int] = 32
+    HNSW_EF_CONSTRUCTION: ClassVar[int] = 80
+    RETRIEVER_EF_SEARCH: ClassVar[int] = 64
     SIMILARITY_THRESHOLD: ClassVar[float] = 0.3
 
 
@@ -76,23 +107,30 @@ class AnnouncementPatternConfig:
     Used to identify French-style dates and agenda patterns in financial documents.
     """
 
-    AGENDA_PATTERN: ClassVar[str] = r"Agenda\s+(\d{4})\s+des annonces financières"
-    FRENCH_DATE_PATTERN: ClassVar[str] = r"\b(\d{1,2})\s+(janvier|février|mars|avril|mai|juin|" r"juillet|août|septembre|octobre|novembre|décembre)\b"
-
-    FRENCH_MONTHS: ClassVar[dict[str, str]] = {
-        "janvier": "01",
-        "février": "02",
-        "mars": "03",
-        "avril": "04",
-        "mai": "05",
-        "juin": "06",
-        "juillet": "07",
-        "août": "08",
-        "septembre": "09",
-        "octobre": "10",
-        "novembre": "11",
-        "décembre": "12",
-    }
+    # Month names in calendar order; the date regex and month numbers are derived from it
+    FRENCH_MONTHS_ORDER: ClassVar[tuple[str, ...]] = (
+        "janvier",
+        "février",
+        "mars",
+        "avril",
+        "mai",
+        "juin",
+        "juillet",
+        "août",
+        "septembre",
+        "octobre",
+        "novembre",
+        "décembre",
+    )
+    FRENCH_MONTHS: ClassVar[dict[str, str]] = {month: f"{number:02d}" for number, month in enumerate(FRENCH_MONTHS_ORDER, 1)}
+
+    # Whitespace including the (narrow) no-break spaces common in French typography, spelled
+    # out so that engines with an ASCII-only \s (e.g. RE2) match the same text as `re`
+    WHITESPACE: ClassVar[str] = "[\\s\u00a0\u202f]"
+
+    # Compiled once at import, matched case-insensitively
+    AGENDA_PATTERN: ClassVar[re.Pattern[str]] = re.compile(rf"Agenda{WHITESPACE}+(\d{{4}}){WHITESPACE}+des annonces financières", re.IGNORECASE)
+    FRENCH_DATE_PATTERN: ClassVar[re.Pattern[str]] = re.compile(rf"\b(\d{{1,2}}){WHITESPACE}+({'|'.join(FRENCH_MONTHS_ORDER)})\b", re.IGNORECASE)
 
 
 class Config:
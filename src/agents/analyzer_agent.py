@@ -2,15 +2,42 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import matplotlib.pyplot as plt
 import pandas as pd
-import yfinance as yf
+import streamlit as st
+from matplotlib.figure import Figure
 
 from configs.config import Config
 from src.utils.announcement_dates_extraction import merge_and_save_all_dates
+from src.utils.figure_export import figure_to_png
+from src.utils.market_data import fetch_ticker
 from src.utils.vehicles_sold_per_year_extraction import save_vehicles_data_to_csv
 
 
+def _build_figure(merged_df: pd.DataFrame) -> Figure:
+    """Build the sales vs stock price scatter plot."""
+    fig = Figure(figsize=(8, 5))
+    ax = fig.subplots()
+    ax.scatter(merged_df["vehicles_sold"], merged_df["avg_stock_price"], color="blue")
+
+    # Label each point with its year
+    points = zip(merged_df["vehicles_sold"].to_numpy(), merged_df["avg_stock_price"].to_numpy(), merged_df["year"].to_numpy(), strict=True)
+    for x, y, year in points:
+        ax.annotate(str(year), (x, y), fontsize=9)
+
+    ax.set_title("Correlation: Vehicle Sales vs Renault Stock Price on Result Days (2020+)")
+    ax.set_xlabel("Vehicles Sold")
+    ax.set_ylabel("Average Stock Price (on result days)")
+    ax.grid(True)
+    fig.tight_layout()
+    return fig
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _render_png(merged_df: pd.DataFrame) -> bytes:
+    """Render the sales vs stock price scatter plot as PNG bytes, cached so identical data is rendered only once."""
+    return figure_to_png(_build_figure(merged_df))
+
+
 class AnalyzerAgent:
     """Analyze the correlation between Renault's vehicle sales and stock price on result days.
 
@@ -54,25 +81,13 @@ class AnalyzerAgent:
         sales_df = sales_df[sales_df["year"] >= self.START_YEAR]
         dates_df = dates_df[dates_df["date"] >= f"{self.START_YEAR}-01-01"]
 
-        # Convert date and extract year
-        dates_df["date"] = pd.to_datetime(dates_df["date"])
-        dates_df["year"] = dates_df["date"].dt.year
-
-        renault_stock = yf.download("RNO.PA", start=f"{self.START_YEAR}-01-01")
-        renault_stock.index = pd.to_datetime(renault_stock.index)
+        renault_stock = fetch_ticker("RNO.PA", f"{self.START_YEAR}-01-01")
 
         # === Average stock price per year on result dates ===
-        stock_by_year = [
-            {
-                "year": year,
-                "avg_stock_price": sum(renault_stock.loc[date]["Close"] for date in group["date"] if date in renault_stock.index)
-                / len([date for date in group["date"] if date in renault_stock.index]),
-            }
-            for year, group in dates_df.groupby("year")
-            if any(date in renault_stock.index for date in group["date"])
-        ]
-
-        stock_df = pd.DataFrame(stock_by_year)
+        # Dates without a trading session are dropped before averaging
+        close = renault_stock["Close"].reindex(pd.to_datetime(dates_df["date"])).dropna()
+        stock_df = close.groupby(close.index.year).mean().rename("avg_stock_price").reset_index(names="year")
+
         merged_df = sales_df.merge(stock_df, on="year", how="inner")
         if merged_df.empty:
             print("No overlapping data to compute correlation.")
@@ -83,23 +98,9 @@ class AnalyzerAgent:
         print(f"Correlation between vehicle sales and Renault stock price on result days: {correlation:.3f}")
 
         # === Plotting ===
-        fig, ax = plt.subplots(figsize=(8, 5))
-        ax.scatter(merged_df["vehicles_sold"], merged_df["avg_stock_price"], color="blue")
-
-        for _, row in merged_df.iterrows():
-            ax.text(row["vehicles_sold"], row["avg_stock_price"], str(row["year"]), fontsize=9)
-
-        ax.set_title("Correlation: Vehicle Sales vs Renault Stock Price on Result Days (2020+)")
-        ax.set_xlabel("Vehicles Sold")
-        ax.set_ylabel("Average Stock Price (on result days)")
-        ax.grid(True)
-        fig.tight_layout()
-
         if streamlit:
-            import streamlit as st
-
-            st.pyplot(fig)
+            st.image(_render_png(merged_df), use_container_width=True)
         else:
-            plt.savefig(self.output_img)
-            plt.close()
+            self.output_img.parent.mkdir(parents=True, exist_ok=True)
+            _build_figure(merged_df).savefig(self.output_img)
             print(f"Graph saved to: {self.output_img}")
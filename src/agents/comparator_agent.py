@@ -1,11 +1,35 @@
 from pathlib import Path
 
-import matplotlib.pyplot as plt
 import pandas as pd
-import yfinance as yf
+import streamlit as st
+from matplotlib.figure import Figure
 
 from configs.config import Config
 from src.utils.announcement_dates_extraction import merge_and_save_all_dates
+from src.utils.figure_export import figure_to_png
+from src.utils.market_data import fetch_ticker
+
+
+def _build_figure(prices_df: pd.DataFrame) -> Figure:
+    """Build the Renault vs CAC40 line chart."""
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    ax.plot(prices_df["date"], prices_df["renault"], label="Renault Stock", marker="o")
+    ax.plot(prices_df["date"], prices_df["cac40"], label="CAC40 Index", marker="s")
+
+    ax.set_title("Renault Stock vs CAC40 on Earnings Dates (2020+)")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Close Price")
+    ax.grid(True)
+    ax.legend()
+    fig.tight_layout()
+    return fig
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _render_png(prices_df: pd.DataFrame) -> bytes:
+    """Render the Renault vs CAC40 line chart as PNG bytes, cached so identical data is rendered only once."""
+    return figure_to_png(_build_figure(prices_df))
 
 
 class ComparatorAgent:
@@ -48,45 +72,20 @@ class ComparatorAgent:
         announcement_dates_df = announcement_dates_df[announcement_dates_df["date"] >= "2020-01-01"]
 
         # === Download stock and index data ===
-        renault_stock = yf.download("RNO.PA", start="2020-01-01")
-        cac40_index = yf.download("^FCHI", start="2020-01-01")
-
-        renault_stock.index = pd.to_datetime(renault_stock.index)
-        cac40_index.index = pd.to_datetime(cac40_index.index)
+        renault_stock = fetch_ticker("RNO.PA", "2020-01-01")
+        cac40_index = fetch_ticker("^FCHI", "2020-01-01")
 
         # === Collect stock prices on announcement dates ===
-        price_records = [
-            {
-                "date": pd.to_datetime(row["date"]),
-                "renault": renault_stock.loc[row["date"]]["Close"],
-                "cac40": cac40_index.loc[row["date"]]["Close"],
-            }
-            for _, row in announcement_dates_df.iterrows()
-            if pd.to_datetime(row["date"]) in renault_stock.index and pd.to_datetime(row["date"]) in cac40_index.index
-        ]
-
-        prices_df = pd.DataFrame(price_records).sort_values("date")
+        dates = pd.DatetimeIndex(pd.to_datetime(announcement_dates_df["date"]).unique(), name="date")
+        prices_df = renault_stock["Close"].reindex(dates).to_frame("renault").join(cac40_index["Close"].reindex(dates).rename("cac40")).dropna().sort_index().reset_index()
         if prices_df.empty:
             print("No overlapping financial data found.")
             return
 
         # === Plotting ===
-        fig, ax = plt.subplots(figsize=(10, 6))
-        ax.plot(prices_df["date"], prices_df["renault"], label="Renault Stock", marker="o")
-        ax.plot(prices_df["date"], prices_df["cac40"], label="CAC40 Index", marker="s")
-
-        ax.set_title("Renault Stock vs CAC40 on Earnings Dates (2020+)")
-        ax.set_xlabel("Date")
-        ax.set_ylabel("Close Price")
-        ax.grid(True)
-        ax.legend()
-        fig.tight_layout()
-
         if streamlit:
-            import streamlit as st
-
-            st.pyplot(fig)
+            st.image(_render_png(prices_df), use_container_width=True)
         else:
-            plt.savefig(self.output_img)
-            plt.close()
+            self.output_img.parent.mkdir(parents=True, exist_ok=True)
+            _build_figure(prices_df).savefig(self.output_img)
             print(f"Stock comparison graph saved to: {self.output_img}")
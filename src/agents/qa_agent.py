@@ -1,12 +1,20 @@
+from __future__ import annotations
+
 import os
+from collections.abc import Iterator
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from dotenv import load_dotenv
 from huggingface_hub import InferenceClient
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.vectorstores import FAISS
 
 from configs.config import Config
+from src.vectorizers._shared import get_query_embedding
+from src.vectorizers.index_store import ensure_merged_index, load_vectorstore_mmap
+
+if TYPE_CHECKING:
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+    from langchain_community.vectorstores import FAISS
 
 # Load environment variables
 load_dotenv()
@@ -15,6 +23,28 @@ if not hf_token:
     error_msg = "Missing HUGGINGFACE_TOKEN in .env"
     raise ValueError(error_msg)
 
+# The prompt ends with this marker; models sometimes repeat it (or the whole prompt) before the answer
+ANSWER_MARKER = "Answer:"
+
+
+def _strip_answer_marker(pieces: Iterator[str]) -> Iterator[str]:
+    """Yield a streamed answer without a leading "Answer:" marker, holding back only the first few characters."""
+    head = ""
+    for piece in pieces:
+        head = (head + piece).lstrip()
+        if ANSWER_MARKER.startswith(head):
+            continue  # nothing yet, or possibly the start of the marker
+        head = head.removeprefix(ANSWER_MARKER).lstrip()
+        if head:
+            yield head
+            break
+    else:
+        # The stream ended while text was held back
+        if head != ANSWER_MARKER:
+            yield head
+        return
+    yield from pieces
+
 
 class QAAgent:
     """Question-answering agent using FAISS vector store and HuggingFace chat LLM."""
@@ -24,39 +54,24 @@ class QAAgent:
         # Initialize HuggingFace InferenceClient
         self.client: InferenceClient = InferenceClient(api_key=hf_token)
 
-        # Initialize embeddings
-        self.embedding: HuggingFaceEmbeddings = HuggingFaceEmbeddings(
-            model_name=Config.models.EMBEDDING_MODEL_NAME,
-            model_kwargs={"device": "cpu"},
-        )
+        # Reuse the process-wide query encoder, so resetting the agent after an upload does not reload it
+        self.embedding: HuggingFaceEmbeddings = get_query_embedding()
 
         # Load FAISS vector store
         self.vectorstore: FAISS = self.load_all_indexes(Config.paths.INDEX_DIR)
 
+        # Trade recall for speed at query time on HNSW indexes (older flat indexes have no graph)
+        if hasattr(self.vectorstore.index, "hnsw"):
+            self.vectorstore.index.hnsw.efSearch = Config.processing.RETRIEVER_EF_SEARCH
+
     def load_all_indexes(self, base_dir: Path) -> FAISS:
-        """Load and merge all FAISS indexes from the given directory."""
-        base_store: FAISS | None = None
-        index_dirs = sorted(base_dir.glob("index_faiss_*"))
-
-        if not index_dirs:
-            msg = f"No FAISS indexes found in {base_dir}"
-            raise FileNotFoundError(msg)
-
-        for path in index_dirs:
-            if not path.is_dir():
-                continue
-            print(f"Loading index from: {path}")
-            store = FAISS.load_local(
-                str(path),
-                self.embedding,
-                allow_dangerous_deserialization=True,
-            )
-            if base_store is None:
-                base_store = store
-            else:
-                base_store.merge_from(store)
+        """Load the merged FAISS index, building it from the per-file indexes if it does not exist yet.
 
-        return base_store
+        The index is read-only at query time, so it is memory-mapped rather than loaded into memory.
+        """
+        merged_path = ensure_merged_index(base_dir, self.embedding)
+        print(f"Loading merged index from: {merged_path}")
+        return load_vectorstore_mmap(merged_path, self.embedding)
 
     def build_prompt(self, context: str, question: str) -> str:
         """Construct the LLM prompt using context and user question."""
@@ -65,27 +80,53 @@ class QAAgent:
             "Use the context to answer the user's question as accurately as possible. "
             "If the context does not contain a clear answer, respond with: 'Not found in context.'"
         )
-        prompt = f"{system_instruction}\n\n" f"Context:\n{context.strip()}\n\n" f"Question: {question.strip()}\n\n" f"Answer:"
+        prompt = f"{system_instruction}\n\n" f"Context:\n{context.strip()}\n\n" f"Question: {question.strip()}\n\n" f"{ANSWER_MARKER}"
         return prompt
 
-    def answer_question(self, question: str) -> str:
-        """Answer a user question using FAISS semantic search and LLM completion."""
+    def build_messages(self, question: str) -> list[dict[str, str]]:
+        """Retrieve context for the question and wrap the prompt as chat messages."""
         # Retrieve relevant documents
         docs = self.vectorstore.similarity_search(question, k=Config.processing.RETRIEVER_K)
         context = "\n\n".join(doc.page_content for doc in docs)
 
         prompt = self.build_prompt(context, question)
+        return [{"role": "user", "content": prompt}]
+
+    def answer_question(self, question: str) -> str:
+        """Answer a user question using FAISS semantic search and LLM completion."""
+        messages = self.build_messages(question)
 
         try:
             # Use HuggingFace chat completions
             completion = self.client.chat.completions.create(
                 model=Config.models.LLM_NAME,
-                messages=[{"role": "user", "content": prompt}],
+                messages=messages,
                 temperature=Config.models.LLM_TEMPERATURE,
             )
             text: str = completion.choices[0].message["content"]
-            return text.split("Answer:")[-1].strip() if "Answer:" in text else text.strip()
+            return text.split(ANSWER_MARKER)[-1].strip()
 
         except Exception as exc:
             error_msg = f"Error generating answer. Question: {question!r}. Exception: {exc}"
             return f"❌ {error_msg}"
+
+    def answer_question_stream(self, question: str) -> Iterator[str]:
+        """Answer a user question like `answer_question`, yielding the answer token by token as it is generated.
+
+        A leading "Answer:" echoed by the model is dropped, as `answer_question` does.
+        """
+        messages = self.build_messages(question)
+
+        try:
+            # Stream HuggingFace chat completions so the first tokens show up immediately
+            stream = self.client.chat.completions.create(
+                model=Config.models.LLM_NAME,
+                messages=messages,
+                temperature=Config.models.LLM_TEMPERATURE,
+                stream=True,
+            )
+            yield from _strip_answer_marker(chunk.choices[0].delta.content for chunk in stream if chunk.choices and chunk.choices[0].delta.content)
+
+        except Exception as exc:
+            error_msg = f"Error generating answer. Question: {question!r}. Exception: {exc}"
+            yield f"❌ {error_msg}"
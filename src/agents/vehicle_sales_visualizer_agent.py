@@ -1,12 +1,43 @@
 from pathlib import Path
 
-import matplotlib.pyplot as plt
 import pandas as pd
+import streamlit as st
+from matplotlib.figure import Figure
 
 from configs.config import Config
+from src.utils.figure_export import figure_to_png
 from src.utils.vehicles_sold_per_year_extraction import save_vehicles_data_to_csv
 
 
+def _build_figure(sales_df: pd.DataFrame) -> Figure:
+    """Build the vehicles sold per year bar chart."""
+    fig = Figure(figsize=(8, 5))
+    ax = fig.subplots()
+    bars = ax.bar(
+        sales_df["year"],  # x-axis: years
+        sales_df["vehicles_sold"],  # y-axis: number of vehicles sold
+        color="steelblue",
+        edgecolor="black",
+    )
+
+    # === Annotate each bar with its value ===
+    ax.bar_label(bars, labels=[f"{height:,}" for height in sales_df["vehicles_sold"].to_numpy()], fontsize=9)
+
+    # === Final chart formatting ===
+    ax.set_title("Vehicles Sold Per Year (2020+)")
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Vehicles Sold")
+    ax.grid(axis="y", linestyle="--", alpha=0.7)
+    fig.tight_layout()
+    return fig
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _render_png(sales_df: pd.DataFrame) -> bytes:
+    """Render the vehicles sold per year bar chart as PNG bytes, cached so identical data is rendered only once."""
+    return figure_to_png(_build_figure(sales_df))
+
+
 class VehicleSalesVisualizerAgent:
     """Visualize vehicle sales data per year (2020+)."""
 
@@ -43,40 +74,10 @@ class VehicleSalesVisualizerAgent:
         if sales_df.empty:
             return  # Exit if no data available
 
-        # === Create the bar chart ===
-        fig, ax = plt.subplots(figsize=(8, 5))
-        bars = ax.bar(
-            sales_df["year"],  # x-axis: years
-            sales_df["vehicles_sold"],  # y-axis: number of vehicles sold
-            color="steelblue",
-            edgecolor="black",
-        )
-
-        # === Annotate each bar with its value ===
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(
-                bar.get_x() + bar.get_width() / 2,
-                height,
-                f"{height:,}",
-                ha="center",
-                va="bottom",
-                fontsize=9,
-            )
-
-        # === Final chart formatting ===
-        ax.set_title("Vehicles Sold Per Year (2020+)")
-        ax.set_xlabel("Year")
-        ax.set_ylabel("Vehicles Sold")
-        ax.grid(axis="y", linestyle="--", alpha=0.7)
-        fig.tight_layout()
-
-        # === Save or render the plot ===
+        # === Render the bar chart in Streamlit or save it ===
         if streamlit:
-            import streamlit as st
-
-            st.pyplot(fig)
+            st.image(_render_png(sales_df), use_container_width=True)
         else:
-            plt.savefig(self.output_img)
-            plt.close()
+            self.output_img.parent.mkdir(parents=True, exist_ok=True)
+            _build_figure(sales_df).savefig(self.output_img)
             print(f"Vehicle sales chart saved to: {self.output_img}")
@@ -1,56 +1,88 @@
 import logging
+import shutil
 from pathlib import Path
 
 import streamlit as st
 
 from configs.config import Config
-from src.vectorizers.ocr_vectorizer import OCRVectorizerAgent
 
 logging.getLogger("PIL").setLevel(logging.ERROR)
 
 
-def download_and_process_images(image_file: object | None = None) -> None:
-    """Save an uploaded image, extract text using OCR, and build a FAISS index.
+def _save_uploaded_image(image_file: object, img_path: Path) -> None:
+    """Write an uploaded image to disk."""
+    # Stream the upload to disk in 1 MiB chunks instead of copying it whole
+    image_file.seek(0)
+    with img_path.open("wb") as f:
+        shutil.copyfileobj(image_file, f, length=1 << 20)
+    st.info(f"🖼️ Saved uploaded image as `{img_path.name}`")
+
+
+def _save_uploaded_images(image_files: list[object]) -> list[Path]:
+    """Save every uploaded image to the image directory, returning the saved paths."""
+    Config.paths.IMAGE_DIR.mkdir(parents=True, exist_ok=True)
+    img_paths = [Config.paths.IMAGE_DIR / Path(image_file.name).name[:70] for image_file in image_files]
+    for image_file, img_path in zip(image_files, img_paths, strict=True):
+        _save_uploaded_image(image_file, img_path)
+    return img_paths
+
+
+def _keep_extracted(chunks_by_image: dict[Path, list]) -> dict[Path, list]:
+    """Report the OCR result of each image, returning only the images that produced text."""
+    for img_path, chunks in chunks_by_image.items():
+        if chunks:
+            st.success(f"✅ Extracted {len(chunks)} text chunks from `{img_path.name}`")
+        else:
+            st.warning(f"⚠️ No text extracted from `{img_path.name}`")
+    return {img_path: chunks for img_path, chunks in chunks_by_image.items() if chunks}
+
+
+def download_and_process_image_batch(image_files: list[object], batch_size: int = 8) -> None:
+    """Save several uploaded images, extract their text with OCR as one batch, and build the FAISS indexes once.
 
     Args:
     ----
-        image_file (streamlit.uploaded_file_manager.UploadedFile | None):
-            Uploaded image file object from Streamlit.
+        image_files (list[streamlit.uploaded_file_manager.UploadedFile]):
+            Uploaded image file objects from Streamlit.
+        batch_size (int): Maximum number of images OCR'd concurrently.
 
     Returns:
     -------
         None
 
     """
-    if not image_file:
+    # Heavy OCR/embedding dependencies are only loaded once an upload is processed
+    from src.vectorizers.index_store import get_index_path, index_files
+    from src.vectorizers.ocr_vectorizer import OCRVectorizerAgent
+
+    if not image_files:
         st.warning("⚠️ No image file provided.")
         return
 
     try:
-        # Safe file name and paths
-        image_name = Path(image_file.name).name[:70]
-        img_path = Config.paths.IMAGE_DIR / image_name
-        Config.paths.IMAGE_DIR.mkdir(parents=True, exist_ok=True)
+        # Save every upload before running OCR
+        img_paths = _save_uploaded_images(image_files)
 
-        # Save image using Path.open()
-        with img_path.open("wb") as f:
-            f.write(image_file.getbuffer())
-        st.info(f"🖼️ Saved uploaded image as `{img_path.name}`")
+        # Only OCR images that are not indexed yet
+        new_paths: list[Path] = []
+        for img_path in img_paths:
+            if get_index_path(img_path).exists():
+                st.info(f"FAISS index already exists for `{img_path.name}`. Skipping.")
+            else:
+                new_paths.append(img_path)
+        if not new_paths:
+            return
 
-        # OCR processing
+        # OCR processing for the whole batch
         vectorizer = OCRVectorizerAgent()
-        chunks = vectorizer.process_image(img_path)
-        if not chunks:
-            st.warning(f"⚠️ No text extracted from `{img_path.name}`")
+        chunks_by_image = _keep_extracted(vectorizer.process_images_batched(new_paths, batch_size=batch_size))
+        if not chunks_by_image:
             return
-        st.success(f"✅ Extracted {len(chunks)} text chunks from `{img_path.name}`")
 
-        # Build FAISS index for all images in directory
-        vectorizer.process_all_images_in_directory(Config.paths.IMAGE_DIR)
-        index_name = img_path.stem.replace(" ", "_").lower()
-        index_path = Config.paths.INDEX_DIR / f"index_faiss_{index_name}"
-        st.success(f"💾 Saved FAISS index for `{img_path.name}` to `{index_path}`")
+        # Build FAISS indexes for the new images only, embedding all chunks in one batch, and add them to the merged index
+        for img_path in index_files(chunks_by_image, vectorizer.embedding):
+            st.success(f"💾 Saved FAISS index for `{img_path.name}` to `{get_index_path(img_path)}`")
 
     except Exception as exc:
-        error_msg = f"Error processing `{image_file.name}`. Exception: {exc}"
+        error_msg = f"Error processing images. Exception: {exc}"
         st.error(f"❌ {error_msg}")
@@ -1,10 +1,10 @@
 import logging
+import shutil
 from pathlib import Path
 
 import streamlit as st
 
 from configs.config import Config
-from src.vectorizers.pdf_vectorizer import PDFVectorizerAgent
 
 logging.getLogger("pdfminer").setLevel(logging.ERROR)
 
@@ -22,6 +22,10 @@ def download_and_process_pdfs(pdf_file: object | None = None) -> None:
         None
 
     """
+    # Heavy PDF/embedding dependencies are only loaded once an upload is processed
+    from src.vectorizers.index_store import get_index_path
+    from src.vectorizers.pdf_vectorizer import PDFVectorizerAgent
+
     if not pdf_file:
         st.warning("⚠️ No PDF file provided.")
         return
@@ -34,11 +38,17 @@ def download_and_process_pdfs(pdf_file: object | None = None) -> None:
         pdf_path = Config.paths.PDF_DIR / pdf_name
         Config.paths.PDF_DIR.mkdir(parents=True, exist_ok=True)
 
-        # Save PDF using Path.open()
+        # Stream the upload to disk in 1 MiB chunks instead of copying it whole
+        pdf_file.seek(0)
         with pdf_path.open("wb") as f:
-            f.write(pdf_file.getbuffer())
+            shutil.copyfileobj(pdf_file, f, length=1 << 20)
         st.info(f"📄 Saved uploaded PDF as `{pdf_path.name}`")
 
+        index_path = get_index_path(pdf_path)
+        if index_path.exists():
+            st.info(f"FAISS index already exists for `{pdf_path.name}`. Skipping.")
+            return
+
         # Extract text chunks
         chunks = vectorizer.process_pdf(pdf_path)
         if not chunks:
@@ -46,10 +56,8 @@ def download_and_process_pdfs(pdf_file: object | None = None) -> None:
             return
         st.success(f"✅ Extracted {len(chunks)} text chunks from `{pdf_path.name}`")
 
-        # Build FAISS index for all PDFs
-        vectorizer.process_all_pdfs_in_directory(Config.paths.PDF_DIR)
-        index_name = pdf_path.stem.replace(" ", "_").lower()
-        index_path = Config.paths.INDEX_DIR / f"index_faiss_{index_name}"
+        # Build FAISS index for the new PDF only and add it to the merged index
+        vectorizer.index_documents(pdf_path, chunks)
         st.success(f"💾 Saved FAISS index for `{pdf_path.name}` to `{index_path}`")
 
     except Exception as exc:
@@ -4,7 +4,6 @@ import streamlit as st
 
 from configs.config import Config
 from src.utils.youtube_content_extraction import extract_youtube_id, transcribe_youtube_audio
-from src.vectorizers.youtube_vectorizer import YBVectorizerAgent
 
 # Suppress noisy logs
 logging.getLogger("pdfminer").setLevel(logging.ERROR)
@@ -22,6 +21,10 @@ def download_and_process_youtube_contents(yt_url: str) -> None:
         None
 
     """
+    # Heavy embedding dependencies are only loaded once a video is processed
+    from src.vectorizers.index_store import get_index_path
+    from src.vectorizers.youtube_vectorizer import YBVectorizerAgent
+
     if not yt_url.strip():
         st.warning("⚠️ No YouTube URL was provided.")
         return
@@ -39,7 +42,15 @@ def download_and_process_youtube_contents(yt_url: str) -> None:
         transcribe_youtube_audio(youtube_url=yt_url, video_name=yb_txt_name)
         st.success(f"✅ Transcript downloaded: yb_{yb_txt_name}.txt")
 
-    # Vectorize and index transcript
+    if get_index_path(yb_txt_path).exists():
+        st.info(f"FAISS index already exists for {yb_txt_path.name}. Skipping.")
+        return
+
+    # Vectorize and index the new transcript only
     vectorizer = YBVectorizerAgent()
-    vectorizer.process_all_txt_in_directory(Config.paths.YOUTUBE_DIR)
+    chunks = vectorizer.process_yb_video(str(yb_txt_path))
+    if not chunks:
+        st.warning(f"⚠️ No text extracted from `{yb_txt_path.name}`")
+        return
+    vectorizer.index_documents(yb_txt_path, chunks)
     st.success("YouTube content processed and indexed!")
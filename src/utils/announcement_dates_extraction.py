@@ -1,11 +1,29 @@
-import re
+import json
+from itertools import chain
 from pathlib import Path
 
 import pandas as pd
-import pdfplumber
-from pdfminer.pdfparser import PDFSyntaxError
 
 from configs.config import Config
+from src.utils.batched_reads import read_files_batched
+from src.utils.csv_writer import write_csv_files
+from src.utils.file_listing import list_files
+from src.utils.pdf_content_extraction import extract_pdf_text
+from src.utils.process_pool import get_process_pool
+
+try:
+    import re2  # google-re2: linear-time matching, no backtracking
+except ImportError:  # Fall back to the patterns compiled with `re` in the config
+    re2 = None
+
+# Patterns are compiled once at module load, with RE2 when it is available
+if re2 is not None:
+    _AGENDA_RE = re2.compile(f"(?i){Config.announcement_patterns.AGENDA_PATTERN.pattern}")
+    _FRENCH_DATE_RE = re2.compile(f"(?i){Config.announcement_patterns.FRENCH_DATE_PATTERN.pattern}")
+else:
+    _AGENDA_RE = Config.announcement_patterns.AGENDA_PATTERN
+    _FRENCH_DATE_RE = Config.announcement_patterns.FRENCH_DATE_PATTERN
+_MONTH_NUMBERS = {month.lower(): number for month, number in Config.announcement_patterns.FRENCH_MONTHS.items()}
 
 
 def extract_financial_announcements(text: str) -> list[str]:
@@ -13,22 +31,16 @@ def extract_financial_announcements(text: str) -> list[str]:
     results: list[str] = []
 
     # Search for patterns like "Agenda 2023 des annonces financières"
-    for agenda_match in re.finditer(Config.announcement_patterns.AGENDA_PATTERN, text, re.IGNORECASE):
+    for agenda_match in _AGENDA_RE.finditer(text):
         year = agenda_match.group(1)
         agenda_start = agenda_match.end()
 
         # Extract 300 characters after the "Agenda" line
         date_block = text[agenda_start : agenda_start + 300]
 
-        # Extract French-style date patterns (e.g., "25 janvier")
-        date_matches = re.findall(Config.announcement_patterns.FRENCH_DATE_PATTERN, date_block, re.IGNORECASE)
-
-        for day, month in date_matches:
-            jour = day.zfill(2)
-            mois = month.lower()
-            mois_num = Config.announcement_patterns.FRENCH_MONTHS.get(mois)
-            if mois_num:
-                results.append(f"{year}-{mois_num}-{jour}")
+        # Extract French-style date patterns (e.g., "25 janvier"); the month group
+        # only matches known month names, so the lookup cannot miss
+        results.extend(f"{year}-{_MONTH_NUMBERS[month.lower()]}-{day.zfill(2)}" for day, month in _FRENCH_DATE_RE.findall(date_block))
 
     return results
 
@@ -37,9 +49,10 @@ def extract_dates_from_txt_dir(directory: Path, source_label: str) -> list[dict[
     """Extract dates from all .txt files in a directory."""
     all_dates: list[dict[str, str]] = []
 
-    for file_path in directory.glob("*.txt"):
+    # Read all files in one batch, then decode and parse them
+    for file_path, content in read_files_batched(list_files(directory, (".txt",))).items():
         print(file_path.name)
-        text = file_path.read_text(encoding="utf-8")
+        text = content.decode("utf-8")
         dates = extract_financial_announcements(text)
         for d in dates:
             all_dates.append({"date": d, "source": source_label})
@@ -47,22 +60,60 @@ def extract_dates_from_txt_dir(directory: Path, source_label: str) -> list[dict[
     return all_dates
 
 
-def extract_dates_from_pdf_dir(directory: Path) -> list[dict[str, str]]:
-    """Extract dates from all .pdf files in a directory using pdfplumber."""
-    all_dates: list[dict[str, str]] = []
+def _dates_cache_path(file_path: Path) -> Path:
+    """Return the sidecar JSON file caching the dates extracted from a PDF."""
+    return file_path.with_name(f"{file_path.name}.dates.json")
 
-    for file_path in directory.glob("*.pdf"):
-        try:
-            with pdfplumber.open(file_path) as pdf:
-                text = "\n".join(page.extract_text() or "" for page in pdf.pages)
-        except (OSError, PDFSyntaxError, ValueError) as e:
-            print(f"Failed to read PDF {file_path.name}: {e}")
-            continue
 
-        dates = extract_financial_announcements(text)
-        for d in dates:
-            all_dates.append({"date": d, "source": "pdf"})
+def _load_cached_dates(file_path: Path) -> list[str] | None:
+    """Return the dates cached for a PDF, or None if there is no cache or the PDF changed since it was written."""
+    cache_path = _dates_cache_path(file_path)
+    if not cache_path.exists():
+        return None
+
+    try:
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if file_path.stat().st_mtime > cache.get("mtime", 0):
+        return None
+    return cache.get("dates")
+
 
+def _extract_one(file_path: Path) -> list[dict[str, str]]:
+    """Extract dates from a single .pdf file using PyMuPDF and cache them in a sidecar JSON file."""
+    try:
+        text = extract_pdf_text(file_path)
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"Failed to read PDF {file_path.name}: {e}")
+        return []
+
+    dates = extract_financial_announcements(text)
+    _dates_cache_path(file_path).write_text(json.dumps({"mtime": file_path.stat().st_mtime, "dates": dates}), encoding="utf-8")
+    return [{"date": d, "source": "pdf"} for d in dates]
+
+
+def extract_dates_from_pdf_dir(directory: Path) -> list[dict[str, str]]:
+    """Extract dates from all .pdf files in a directory using PyMuPDF.
+
+    Dates cached next to unchanged PDFs are reused. PDF parsing is CPU-bound, so the other
+    files are processed in parallel on the shared worker process pool.
+    """
+    all_dates: list[dict[str, str]] = []
+    paths: list[Path] = []
+    for file_path in list_files(directory, (".pdf",)):
+        cached_dates = _load_cached_dates(file_path)
+        if cached_dates is None:
+            paths.append(file_path)
+        else:
+            all_dates.extend({"date": d, "source": "pdf"} for d in cached_dates)
+
+    if len(paths) <= 1:
+        # Not worth starting a process pool for a single file
+        all_dates.extend(chain.from_iterable(map(_extract_one, paths)))
+        return all_dates
+
+    all_dates.extend(chain.from_iterable(get_process_pool().map(_extract_one, paths, chunksize=4)))
     return all_dates
 
 
@@ -76,12 +127,17 @@ def merge_and_save_all_dates(pdf_dir: Path) -> pd.DataFrame:
         print("❌ No dates were extracted.")
         return pd.DataFrame()
 
-    merged_dates_df = pd.DataFrame(all_dates).drop_duplicates()
-    merged_dates_df = merged_dates_df.dropna(subset=["date"]).sort_values(by="date")
+    merged_dates_df = pd.DataFrame.from_records(all_dates, columns=["date", "source"])
+    merged_dates_df["source"] = merged_dates_df["source"].astype("category")
+    merged_dates_df = merged_dates_df.drop_duplicates(ignore_index=True)
+
+    # Parse dates for a native datetime sort; impossible dates (e.g. "30 février") become NaT and are dropped
+    merged_dates_df["date"] = pd.to_datetime(merged_dates_df["date"], format="%Y-%m-%d", errors="coerce", cache=True)
+    merged_dates_df = merged_dates_df.dropna(subset=["date"]).sort_values(by="date", kind="mergesort", ignore_index=True)
 
-    # Save results to CSV
+    # Save results to CSV, keeping plain YYYY-MM-DD dates
     output_csv = Config.paths.FINANCIAL_DIR / Config.paths.ANNOUNCEMENT_DATE_FILE_NAME
-    merged_dates_df.to_csv(output_csv, index=False)
+    write_csv_files([(output_csv, merged_dates_df.assign(date=merged_dates_df["date"].dt.strftime("%Y-%m-%d")))])
 
     print(f"{len(merged_dates_df)} dates saved to: {output_csv}")
     return merged_dates_df
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+
+# Unquoted rows like `DataFrame.to_csv`; pyarrow raises on values that would need quoting
+_WRITE_OPTIONS = pa_csv.WriteOptions(include_header=False, quoting_style="none")
+_CSV_SPECIAL_CHARS = frozenset(',"\r\n')
+
+
+def _pyarrow_compatible(df: pd.DataFrame) -> bool:
+    """Return whether the DataFrame's shape, headers and dtypes allow pyarrow to write it like pandas would."""
+    if len(df.columns) == 1:
+        return False  # pandas quotes an empty single cell as "", pyarrow writes an empty line that read_csv skips
+    if df.columns.hasnans or not df.columns.is_unique:
+        return False  # missing (None) headers become "None", repeated ones are rejected
+    if any(_CSV_SPECIAL_CHARS.intersection(str(col)) for col in df.columns):
+        return False  # headers needing quotes
+    # Floats ("1" vs "1.0"), bools ("true" vs "True") and datetimes are formatted differently
+    return all(dtype.kind in "iuO" for dtype in df.dtypes)
+
+
+def _is_written_like_pandas(data_type: pa.DataType) -> bool:
+    """Return whether pyarrow formats values of this Arrow type like pandas does."""
+    return pa.types.is_string(data_type) or pa.types.is_large_string(data_type) or pa.types.is_integer(data_type) or pa.types.is_null(data_type)
+
+
+def _write_csv_pyarrow(csv_path: Path, df: pd.DataFrame) -> None:
+    """Write a DataFrame as CSV with pyarrow, in the same format as `to_csv(index=False)`.
+
+    Raises TypeError if an object column holds values pyarrow formats differently (e.g. bools).
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if not all(_is_written_like_pandas(field.type) for field in table.schema):
+        msg = f"Unsupported column types for pyarrow CSV output: {table.schema}"
+        raise TypeError(msg)
+
+    with csv_path.open("wb") as f:
+        # pyarrow always quotes header names, so the header line is written here
+        f.write((",".join(table.column_names) + "\n").encode("utf-8"))
+        pa_csv.write_csv(table, f, write_options=_WRITE_OPTIONS)
+
+
+def write_csv_files(outputs: list[tuple[Path, pd.DataFrame]]) -> None:
+    """Write DataFrames to CSV files in one batch using pyarrow's C++ CSV writer.
+
+    Only multi-column tables of strings and integers go through pyarrow, as `to_csv` would write them. Other tables
+    (single column, float/bool/datetime values, missing, repeated or quoted headers, values needing quotes) are
+    written with pandas instead.
+    """
+    for directory in {csv_path.parent for csv_path, _ in outputs}:
+        directory.mkdir(parents=True, exist_ok=True)
+
+    for csv_path, df in outputs:
+        if not _pyarrow_compatible(df):
+            df.to_csv(csv_path, index=False)
+            continue
+        try:
+            _write_csv_pyarrow(csv_path, df)
+        except (pa.ArrowException, ValueError, TypeError):
+            df.to_csv(csv_path, index=False)
@@ -0,0 +1,14 @@
+import io
+
+from matplotlib.figure import Figure
+
+
+def figure_to_png(fig: Figure) -> bytes:
+    """Render a matplotlib figure to PNG bytes, with the same settings `st.pyplot` uses.
+
+    Charts are cached as these bytes rather than as Figures: matplotlib is not thread-safe,
+    so Streamlit sessions must never draw the same Figure concurrently.
+    """
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=200, bbox_inches="tight")
+    return buffer.getvalue()
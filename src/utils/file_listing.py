@@ -0,0 +1,14 @@
+import os
+from pathlib import Path
+
+
+def list_files(directory: Path, suffixes: tuple[str, ...]) -> list[Path]:
+    """List the files in a directory whose extension is one of `suffixes` (case-insensitive).
+
+    Uses a single `os.scandir` pass: entry types come from the directory listing, so no file is stat'ed.
+    """
+    if not directory.is_dir():
+        return []
+
+    with os.scandir(directory) as entries:
+        return [Path(entry.path) for entry in entries if entry.name.lower().endswith(suffixes) and entry.is_file()]
@@ -0,0 +1,26 @@
+import pandas as pd
+import streamlit as st
+import yfinance as yf
+
+# Market data is refreshed at most once per hour
+MARKET_DATA_TTL_SECONDS: int = 3600
+
+
+# st.cache_data returns a copy on each call, and also caches in memory outside a Streamlit app (CLI runs)
+@st.cache_data(ttl=MARKET_DATA_TTL_SECONDS, show_spinner=False)
+def fetch_ticker(ticker: str, start: str) -> pd.DataFrame:
+    """Return daily price history for a ticker since `start` from Yahoo Finance, cached across calls and sessions.
+
+    Args:
+    ----
+        ticker (str): Yahoo Finance symbol (e.g. "RNO.PA", "^FCHI").
+        start (str): First date to download, formatted as "YYYY-MM-DD".
+
+    Returns:
+    -------
+        pd.DataFrame: Price history indexed by date.
+
+    """
+    prices = yf.download(ticker, start=start, multi_level_index=False)
+    prices.index = pd.to_datetime(prices.index)
+    return prices
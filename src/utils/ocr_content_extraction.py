@@ -1,42 +1,151 @@
 import re
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from itertools import groupby
 from pathlib import Path
 
 import cv2
+import numpy as np
 import pandas as pd
 import pytesseract
-from PIL import Image
 
 from configs.config import Config
+from src.utils.csv_writer import write_csv_files
+
+try:
+    from tesserocr import PyTessBaseAPI
+except ImportError:  # Fall back to one pytesseract subprocess per OCR call
+    PyTessBaseAPI = None
+
+# Word-level OCR result: one list per TSV column (left, top, width, height, conf, text, ...)
+OcrData = dict[str, list]
+
+_TSV_COLUMNS = ("level", "page_num", "block_num", "par_num", "line_num", "word_num", "left", "top", "width", "height", "conf", "text")
+_TSV_INT_COLUMNS = frozenset(_TSV_COLUMNS[:10])
+
+# Smallest connected component (in pixels) considered as a candidate table region
+MIN_REGION_AREA: int = 500
+
+_WS_RE = re.compile(r"[ \t]+")
+_NL_RE = re.compile(r"\n\s*\n+")
 
 
 def clean_ocr_text(text: str) -> str:
     """Clean and normalize OCR text to avoid long unwanted shifts."""
     # Replace multiple spaces with a single space
-    text = re.sub(r"[ \t]+", " ", text)
+    text = _WS_RE.sub(" ", text)
 
     # Replace multiple newlines with a single newline
-    text = re.sub(r"\n\s*\n+", "\n", text)
+    text = _NL_RE.sub("\n", text)
+
+    # Strip leading/trailing spaces on each line and remove empty lines
+    return "\n".join(filter(None, (line.strip() for line in text.splitlines())))
+
+
+def _parse_tsv(tsv: str) -> OcrData:
+    """Parse Tesseract TSV output (without header) into a column dict like `pytesseract.Output.DICT`."""
+    data: OcrData = {col: [] for col in _TSV_COLUMNS}
+    for line in tsv.splitlines():
+        fields = line.split("\t", len(_TSV_COLUMNS) - 1)
+        if len(fields) != len(_TSV_COLUMNS):
+            continue
+        for col, value in zip(_TSV_COLUMNS, fields, strict=True):
+            data[col].append(int(value) if col in _TSV_INT_COLUMNS else value)
+    data["conf"] = [float(c) for c in data["conf"]]
+    return data
+
+
+@contextmanager
+def _tesseract_reader(lang: str = "eng") -> Iterator[Callable[[np.ndarray], OcrData]]:
+    """Yield a function returning word-level OCR data for a grayscale image array.
+
+    With tesserocr installed, all calls share one Tesseract instance instead of
+    spawning a process (and reloading the language model) per call.
+    """
+    if PyTessBaseAPI is None:
+        yield lambda image: pytesseract.image_to_data(image, lang=lang, output_type=pytesseract.Output.DICT)
+        return
+
+    with PyTessBaseAPI(lang=lang) as api:
+
+        def read(image: np.ndarray) -> OcrData:
+            # Hand the 8-bit grayscale buffer to Tesseract directly (1 byte per pixel, rows of `width` bytes)
+            height, width = image.shape
+            api.SetImageBytes(np.ascontiguousarray(image).tobytes(), width, height, 1, width)
+            return _parse_tsv(api.GetTSVText(0))
+
+        yield read
+
 
-    # Strip leading/trailing spaces on each line
-    lines = [line.strip() for line in text.splitlines()]
-    text = "\n".join([line for line in lines if line])  # remove empty lines
+def _words(data: OcrData) -> list[dict]:
+    """Return the recognized (non-empty) words of an OCR result as dicts."""
+    return [
+        {"left": left, "top": top, "width": width, "height": height, "line": (block, par, line), "text": text.strip()}
+        for left, top, width, height, block, par, line, text in zip(
+            data["left"], data["top"], data["width"], data["height"], data["block_num"], data["par_num"], data["line_num"], data["text"], strict=True
+        )
+        if text and text.strip()
+    ]
 
-    return text.strip()
+
+def _page_text(words: list[dict]) -> str:
+    """Rebuild the page text from words, one line per Tesseract text line."""
+    return "\n".join(" ".join(w["text"] for w in line_words) for _, line_words in groupby(words, key=lambda w: w["line"]))
+
+
+def _region_rows(words: list[dict], box: tuple[int, int, int, int]) -> list[list[str]]:
+    """Group the words inside a bounding box into rows by their vertical position."""
+    x, y, w, h = box
+    inside = sorted((wd for wd in words if x <= wd["left"] < x + w and y <= wd["top"] < y + h), key=lambda wd: wd["top"])
+
+    rows: list[list[dict]] = []
+    row_top = 0
+    for word in inside:
+        # Same row while the word starts within half a line-height of the row top
+        if not rows or word["top"] - row_top > word["height"] / 2:
+            rows.append([])
+            row_top = word["top"]
+        rows[-1].append(word)
+
+    return [[wd["text"] for wd in sorted(row, key=lambda wd: wd["left"])] for row in rows]
+
+
+def _region_boxes(thresh: np.ndarray) -> np.ndarray:
+    """Return the [x, y, w, h] boxes of large connected components, skipping boxes nested inside another one."""
+    _, _, stats, _ = cv2.connectedComponentsWithStats(thresh, connectivity=8)
+    stats = stats[1:]  # label 0 is the background
+    boxes = stats[stats[:, cv2.CC_STAT_AREA] > MIN_REGION_AREA, :4]
+
+    # contains[i, j]: box i encloses box j (ties between identical boxes keep the first one)
+    x0, y0 = boxes[:, 0], boxes[:, 1]
+    x1, y1 = x0 + boxes[:, 2], y0 + boxes[:, 3]
+    order = np.arange(len(boxes))
+    contains = (x0[:, None] <= x0) & (y0[:, None] <= y0) & (x1[:, None] >= x1) & (y1[:, None] >= y1)
+    identical = (x0[:, None] == x0) & (y0[:, None] == y0) & (x1[:, None] == x1) & (y1[:, None] == y1)
+    contains &= ~identical | (order[:, None] < order)
+    return boxes[~contains.any(axis=0)]
 
 
 def extract_image_content(file_path: Path, img_name: str) -> tuple[str, list[pd.DataFrame]]:
     """Extract text and tables from an image using Tesseract OCR."""
     full_text = ""  # Extracted text
     tables_data: list[pd.DataFrame] = []  # Detected tables
+    csv_outputs: list[tuple[Path, pd.DataFrame]] = []  # Tables to save, written once all regions are read
 
-    # Ensure output dirs exist
-    Config.paths.TABLE_DIR.mkdir(parents=True, exist_ok=True)
+    # Ensure text output dir exists (table CSV dirs are created when written)
     Config.paths.TXT_FROM_IMAGE_DIR.mkdir(parents=True, exist_ok=True)
 
-    # === Extract raw text with Tesseract ===
-    image = Image.open(file_path)
-    raw_text = pytesseract.image_to_string(image, lang="eng")
+    # === Decode the image once, as grayscale, for both OCR and table detection ===
+    img_cv = cv2.imread(str(file_path), cv2.IMREAD_GRAYSCALE)
+    if img_cv is None:
+        print(f"Could not read image {file_path.name}")
+        return full_text, tables_data
+
+    # === Run Tesseract once for word boxes, reused for text and tables ===
+    with _tesseract_reader(lang="eng") as read_data:
+        words = _words(read_data(img_cv))
 
+    raw_text = _page_text(words)
     if raw_text:
         # ✅ Clean text to avoid long shifts
         text = clean_ocr_text(raw_text)
@@ -49,27 +158,19 @@ def extract_image_content(file_path: Path, img_name: str) -> tuple[str, list[pd.
         full_text = text
 
     # === Optional: detect tables ===
-    img_cv = cv2.imread(str(file_path), cv2.IMREAD_GRAYSCALE)
-    if img_cv is not None:
-        _, thresh = cv2.threshold(img_cv, 150, 255, cv2.THRESH_BINARY_INV)
-        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-        for i, cnt in enumerate(contours, 1):
-            x, y, w, h = cv2.boundingRect(cnt)
-            roi = img_cv[y : y + h, x : x + w]
-
-            # OCR on each detected region
-            table_text = pytesseract.image_to_string(roi, lang="eng")
-            table_text = clean_ocr_text(table_text)
-
-            if table_text.strip():
-                rows = [r.split() for r in table_text.split("\n") if r.strip()]
-                table_df = pd.DataFrame(rows)  # avoid generic 'df'
-                tables_data.append(table_df)
-
-                # Save CSV
-                csv_path = Config.paths.TABLE_DIR / f"{img_name}_table_{i}.csv"
-                table_df.to_csv(csv_path, index=False)
+    _, thresh = cv2.threshold(img_cv, 150, 255, cv2.THRESH_BINARY_INV)
+
+    # Slice the words of each detected region out of the page OCR
+    for i, box in enumerate(_region_boxes(thresh).tolist(), 1):
+        rows = _region_rows(words, box)
+        if rows:
+            table_df = pd.DataFrame(rows)  # avoid generic 'df'
+            tables_data.append(table_df)
+
+            # Queue CSV
+            csv_outputs.append((Config.paths.TABLE_DIR / f"{img_name}_table_{i}.csv", table_df))
+
+    write_csv_files(csv_outputs)
 
     print(f"Extracted text and {len(tables_data)} tables from {file_path.name}")
 
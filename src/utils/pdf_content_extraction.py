@@ -1,41 +1,77 @@
 import logging
+from itertools import chain, repeat
 from pathlib import Path
 
+import fitz  # PyMuPDF
 import pandas as pd
-import pdfplumber
 
 from configs.config import Config
+from src.utils.csv_writer import write_csv_files
+from src.utils.process_pool import get_process_pool
 
 # Configure a module-level logger
 logger = logging.getLogger(__name__)
 
+# Pages handled by each worker process when extracting large PDFs
+PAGES_PER_WORKER: int = 16
+
+
+def extract_pdf_text(file_path: Path) -> str:
+    """Extract the text of every page of a born-digital PDF with PyMuPDF."""
+    with fitz.open(file_path) as doc:
+        return "\n".join(page.get_text("text") for page in doc)
+
+
+def _extract_page_range(file_path: Path, start: int, stop: int) -> list[tuple[str, list[list[str | None]] | None]]:
+    """Extract the text and the largest table (if any) of pages `start` to `stop - 1` of a PDF.
+
+    Each call opens its own document: PyMuPDF objects cannot be shared between threads or processes.
+    """
+    pages: list[tuple[str, list[list[str | None]] | None]] = []
+    with fitz.open(file_path) as doc:
+        for page in doc.pages(start, stop):
+            found_tables = page.find_tables().tables
+            table = max(found_tables, key=lambda t: t.row_count * t.col_count).extract() if found_tables else None
+            pages.append((page.get_text("text"), table))
+    return pages
+
 
 def extract_pdf_content(file_path: Path, pdf_name: str) -> tuple[str, list[pd.DataFrame]]:
-    """Extract textual and tabular content from a given PDF file."""
-    full_text = ""  # Accumulate all page texts
+    """Extract textual and tabular content from a given PDF file.
+
+    Large PDFs are split into page ranges processed in parallel on the shared worker process pool.
+    """
+    text_parts: list[str] = []  # Accumulate all page texts, joined once at the end
     tables_data: list[pd.DataFrame] = []  # Store extracted tables as DataFrames
+    csv_outputs: list[tuple[Path, pd.DataFrame]] = []  # Tables to save, written once after the page loop
+
+    # Split the pages into ranges; small PDFs are read in-process
+    with fitz.open(file_path) as doc:
+        page_count = doc.page_count
+    starts = range(0, page_count, PAGES_PER_WORKER)
+    stops = [min(start + PAGES_PER_WORKER, page_count) for start in starts]
+
+    mapper = map if len(starts) <= 1 else get_process_pool().map
+    page_ranges = list(mapper(_extract_page_range, repeat(file_path), starts, stops))
+
+    # Loop through each page of the PDF, in page order
+    for i, (text, table) in enumerate(chain.from_iterable(page_ranges), 1):
+        # === Append text ===
+        if text:
+            text_parts.append(text)
+
+        # === Keep the largest table if any ===
+        if table:
+            # Convert raw table data to a DataFrame
+            table_df = pd.DataFrame(table[1:], columns=table[0] if len(table) > 1 else None)
+            tables_data.append(table_df)
+
+            # Queue the table to be saved as a CSV file
+            csv_outputs.append((Config.paths.TABLE_DIR / f"{pdf_name}_table_page_{i}.csv", table_df))
 
-    # Open the PDF file for reading
-    with pdfplumber.open(file_path) as pdf:
-        # Loop through each page of the PDF
-        for i, page in enumerate(pdf.pages, 1):
-            # === Extract and append text ===
-            text = page.extract_text()
-            if text:
-                full_text += text + "\n"
-
-            # === Extract tables if any ===
-            table = page.extract_table()
-            if table:
-                # Convert raw table data to a DataFrame
-                table_df = pd.DataFrame(table[1:], columns=table[0] if len(table) > 1 else None)
-                tables_data.append(table_df)
-
-                # Save the table as a CSV file
-                csv_path = Config.paths.TABLE_DIR / f"{pdf_name}_table_page_{i}.csv"
-                csv_path.parent.mkdir(parents=True, exist_ok=True)
-                table_df.to_csv(csv_path, index=False)
+    write_csv_files(csv_outputs)
 
+    full_text = "\n".join(text_parts)
     logger.info(f"✅ Extracted text and {len(tables_data)} tables from {file_path.name}")
 
     # Return the text and list of tables
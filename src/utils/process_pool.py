@@ -0,0 +1,26 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+# Upper bound on worker processes for all CPU-bound extraction, whatever the number of concurrent uploads.
+# Workers live as long as the app, so the pool stays small even on many-core machines
+MAX_PROCESS_WORKERS: int = min(4, os.cpu_count() or 1)
+
+_POOL: ProcessPoolExecutor | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the process pool shared by CPU-bound extraction tasks, creating it on first use.
+
+    Workers are started with "spawn": forking the multi-threaded Streamlit/torch process is unsafe.
+    The pool is reused across uploads, so concurrent uploads share its bounded set of workers.
+    Each worker imports the module of the function it runs, so those modules must stay free of heavy
+    imports such as torch (see `Config.models.get_device`).
+    """
+    global _POOL  # noqa: PLW0603 - one pool per process
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(max_workers=MAX_PROCESS_WORKERS, mp_context=get_context("spawn"))
+        return _POOL
@@ -3,17 +3,21 @@ from langchain.text_splitter import RecursiveCharacterTextSplitter
 
 from configs.config import Config
 
+# Recursive character splitter with configured chunk size and overlap, built once and reused
+_SPLITTER = RecursiveCharacterTextSplitter(
+    chunk_size=Config.processing.CHUNK_SIZE,  # Max characters per chunk
+    chunk_overlap=Config.processing.CHUNK_OVERLAP,  # Overlap between consecutive chunks
+)
+
 
 def split_text_into_chunks(text: str) -> list[Document]:
     """Split a long piece of text into smaller overlapping chunks. Useful for preparing text for vectorization and embedding models."""
-    # Initialize a recursive character splitter with configured chunk size and overlap
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=Config.processing.CHUNK_SIZE,  # Max characters per chunk
-        chunk_overlap=Config.processing.CHUNK_OVERLAP,  # Overlap between consecutive chunks
-    )
-
-    # Wrap the input text in a Document object (LangChain expects this format)
-    docs = [Document(page_content=text)]
+    if len(text) < Config.processing.WINDOW_SPLITTING_MIN_CHARS:
+        # Split the raw string and wrap each chunk in a Document (LangChain expects this format)
+        return [Document(page_content=chunk) for chunk in _SPLITTER.split_text(text)]
 
-    # Perform the actual splitting and return the list of chunks
-    return splitter.split_documents(docs)
+    # Very large inputs: slice fixed-size overlapping windows, dropping whitespace-only chunks like the LangChain splitter does
+    chunk_size, chunk_overlap = Config.processing.CHUNK_SIZE, Config.processing.CHUNK_OVERLAP
+    starts = range(0, max(len(text) - chunk_overlap, 1), max(1, chunk_size - chunk_overlap))
+    chunks = (text[start : start + chunk_size].strip() for start in starts)
+    return [Document(page_content=chunk) for chunk in chunks if chunk]
@@ -24,6 +24,7 @@ def save_vehicles_data_to_csv() -> pd.DataFrame:
 
     # === Define output path and save as CSV ===
     output_path: Path = Config.paths.FINANCIAL_DIR / Config.paths.VEHICLE_SOLD_FILE_NAME
+    output_path.parent.mkdir(parents=True, exist_ok=True)
     sales_df.to_csv(output_path, index=False)  # Save without row index
 
     # === Confirmation message ===
@@ -1,41 +1,49 @@
+from __future__ import annotations
+
+import os
 import re
 import uuid
-from urllib.parse import parse_qs, urlparse
-
-import yt_dlp  # Used to download YouTube audio
-from faster_whisper import WhisperModel  # Efficient transcription model
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
 from configs.config import Config
 
+# yt-dlp and faster-whisper are slow to import, so they are only loaded when a video is transcribed
+if TYPE_CHECKING:
+    from faster_whisper import WhisperModel
+
+# Video ID of standard (watch?v=ID), shortened (youtu.be/ID) and embedded (/embed/ID) YouTube URLs;
+# IDs are exactly 11 characters, so a longer run of ID characters is not a match
+_YT_ID_RE = re.compile(r"(?:[?&]v=|youtu\.be/|/embed/)([a-zA-Z0-9_-]{11})(?![\w-])")
+
 
 def extract_youtube_id(url: str) -> str | None:
     """Extract the YouTube video ID from different URL formats."""
-    parsed_url = urlparse(url)
+    match = _YT_ID_RE.search(url)
+    return match.group(1) if match else None
 
-    # Standard YouTube URL (e.g., https://www.youtube.com/watch?v=VIDEO_ID)
-    if parsed_url.hostname in {"www.youtube.com", "youtube.com"}:
-        query = parse_qs(parsed_url.query)
-        return query.get("v", [None])[0]
 
-    # Shortened YouTube URL (e.g., https://youtu.be/VIDEO_ID)
-    if parsed_url.hostname == "youtu.be":
-        return parsed_url.path.strip("/")
+@lru_cache(maxsize=2)
+def get_whisper_model(model_size: str, device: str) -> WhisperModel:
+    """Load a Whisper model once per (size, device), int8-quantized (with float16 activations on GPU)."""
+    from faster_whisper import WhisperModel  # Efficient transcription model
 
-    # Embedded video URL (e.g., https://www.youtube.com/embed/VIDEO_ID)
-    match = re.match(r"^/embed/([a-zA-Z0-9_-]{11})", parsed_url.path)
-    if match:
-        return match.group(1)
-
-    return None
+    compute_type = "int8_float16" if device == "cuda" else "int8"
+    return WhisperModel(model_size, device=device, compute_type=compute_type, cpu_threads=max(1, (os.cpu_count() or 1) // 2))
 
 
 def transcribe_youtube_audio(
     youtube_url: str,
     video_name: str,
     model_size: str = "base",
-    device: str = "cpu",
+    device: str | None = None,
 ) -> str | None:
-    """Download audio from a YouTube video, transcribe it using Whisper, and save the transcript."""
+    """Download audio from a YouTube video, transcribe it using Whisper, and save the transcript.
+
+    `device` defaults to the device the other models run on.
+    """
+    import yt_dlp  # Used to download YouTube audio
+
     # Ensure audio output directory exists
     audio_dir = Config.paths.YOUTUBE_DIR / "audios"
     audio_dir.mkdir(parents=True, exist_ok=True)
@@ -78,7 +86,7 @@ def transcribe_youtube_audio(
 
     # Transcribe audio
     print("Transcribing audio...")
-    model = WhisperModel(model_size, device=device)
+    model = get_whisper_model(model_size, device or Config.models.get_device())
     segments, _ = model.transcribe(str(mp3_path), beam_size=5)
     text = " ".join(segment.text for segment in segments)
 
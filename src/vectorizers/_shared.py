@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from configs.config import Config
+
+if TYPE_CHECKING:
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+
+
+@lru_cache(maxsize=1)
+def get_embedding() -> HuggingFaceEmbeddings:
+    """Return the embedding model shared by all vectorizer agents, loading the weights only once."""
+    # sentence-transformers/torch are imported on first use rather than with the vectorizer modules
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+
+    return HuggingFaceEmbeddings(
+        model_name=Config.models.EMBEDDING_MODEL_NAME,
+        model_kwargs=Config.models.get_embedding_model_kwargs(),
+        encode_kwargs=Config.models.EMBEDDING_ENCODE_KWARGS,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_query_embedding() -> HuggingFaceEmbeddings:
+    """Return the embedding model used to encode questions, int8-quantized when running on CPU, built only once.
+
+    Without quantization this is the shared `get_embedding()` model, so the weights are not loaded twice.
+    """
+    if Config.models.get_device() != "cpu" or not Config.models.EMBEDDING_QUANTIZE_ON_CPU:
+        return get_embedding()
+
+    import torch
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+
+    # A separate copy: quantizing the shared model in place would also change the document embeddings
+    embedding = HuggingFaceEmbeddings(
+        model_name=Config.models.EMBEDDING_MODEL_NAME,
+        model_kwargs=Config.models.get_embedding_model_kwargs(),
+        encode_kwargs=Config.models.EMBEDDING_ENCODE_KWARGS,
+    )
+    # int8 Linear layers speed up CPU encoding of questions
+    embedding.client = torch.quantization.quantize_dynamic(embedding.client, {torch.nn.Linear}, dtype=torch.qint8)
+    return embedding
@@ -0,0 +1,220 @@
+import pickle
+import tempfile
+import threading
+from pathlib import Path
+
+import faiss
+from langchain.docstore.document import Document
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
+from langchain_core.embeddings import Embeddings
+
+from configs.config import Config
+
+# Uploads are processed concurrently; serialize read-modify-write cycles of the merged index
+_MERGED_INDEX_LOCK = threading.Lock()
+
+
+def get_index_path(source_path: Path) -> Path:
+    """Return the per-file FAISS index directory for a source document."""
+    index_name = source_path.stem.replace(" ", "_").lower()
+    return Config.paths.INDEX_DIR / f"index_faiss_{index_name}"
+
+
+def get_merged_index_path() -> Path:
+    """Return the directory of the FAISS index merging all per-file indexes."""
+    return Config.paths.INDEX_DIR / Config.paths.MERGED_INDEX_NAME
+
+
+def create_faiss_index(dimension: int) -> faiss.Index:
+    """Create an empty HNSW index so search cost grows logarithmically with the corpus.
+
+    Embeddings are L2-normalized, so inner product ranks documents by cosine similarity.
+    Vectors are stored as float16, half the size of float32 with near-exact recall. Unlike 8-bit codes,
+    float16 needs no training, so a fixed quantization range cannot waste precision on small embedding components.
+    """
+    index = faiss.IndexHNSWSQ(dimension, faiss.ScalarQuantizer.QT_fp16, Config.processing.HNSW_M, faiss.METRIC_INNER_PRODUCT)
+    index.hnsw.efConstruction = Config.processing.HNSW_EF_CONSTRUCTION
+    index.hnsw.efSearch = Config.processing.RETRIEVER_EF_SEARCH
+    return index
+
+
+def create_vectorstore(embedding: Embeddings, dimension: int) -> FAISS:
+    """Create an empty FAISS vector store backed by a float16 HNSW inner-product index."""
+    return FAISS(
+        embedding_function=embedding,
+        index=create_faiss_index(dimension),
+        docstore=InMemoryDocstore(),
+        index_to_docstore_id={},
+        distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+    )
+
+
+def load_vectorstore(path: Path, embedding: Embeddings) -> FAISS:
+    """Load a FAISS vector store saved with `save_local`."""
+    return FAISS.load_local(
+        str(path),
+        embedding,
+        allow_dangerous_deserialization=True,
+        distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+    )
+
+
+def load_vectorstore_mmap(path: Path, embedding: Embeddings) -> FAISS:
+    """Load a FAISS vector store read-only, memory-mapping the index file instead of copying it into the heap.
+
+    The index must not be modified afterwards. Only the small docstore pickle is read into memory.
+    The mapped file must never be rewritten in place (see `_replace_merged_index`).
+    """
+    # IO_FLAG_MMAP only maps IVF inverted lists; IO_FLAG_MMAP_IFC maps the whole file for any index type
+    index = faiss.read_index(str(path / "index.faiss"), faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY)
+    with (path / "index.pkl").open("rb") as f:
+        docstore, index_to_docstore_id = pickle.load(f)  # noqa: S301 - written by save_local
+
+    return FAISS(
+        embedding_function=embedding,
+        index=index,
+        docstore=docstore,
+        index_to_docstore_id=index_to_docstore_id,
+        distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+    )
+
+
+def _vectorstore_from_embeddings(docs: list[Document], vectors: list[list[float]], embedding: Embeddings) -> FAISS:
+    """Store already embedded documents in a FAISS vector store backed by an HNSW index."""
+    store = create_vectorstore(embedding, len(vectors[0]))
+    store.add_embeddings([(doc.page_content, vector) for doc, vector in zip(docs, vectors, strict=True)], metadatas=[doc.metadata for doc in docs])
+    return store
+
+
+def build_vectorstore(docs: list[Document], embedding: Embeddings) -> FAISS:
+    """Embed documents and store them in a FAISS vector store backed by an HNSW index."""
+    vectors = embedding.embed_documents([doc.page_content for doc in docs])
+    return _vectorstore_from_embeddings(docs, vectors, embedding)
+
+
+def build_vectorstores(docs_by_source: dict[Path, list[Document]], embedding: Embeddings) -> dict[Path, FAISS]:
+    """Build one vector store per source file, embedding the documents of all sources in a single batched call."""
+    vectors = embedding.embed_documents([doc.page_content for docs in docs_by_source.values() for doc in docs])
+
+    stores: dict[Path, FAISS] = {}
+    start = 0
+    for source_path, docs in docs_by_source.items():
+        stores[source_path] = _vectorstore_from_embeddings(docs, vectors[start : start + len(docs)], embedding)
+        start += len(docs)
+    return stores
+
+
+def save_vectorstores(stores: dict[Path, FAISS], embedding: Embeddings) -> None:
+    """Save each per-file vector store to its index directory, then fold them all into the merged index at once."""
+    for source_path, store in stores.items():
+        index_path = get_index_path(source_path)
+        store.save_local(str(index_path))
+        print(f"Saved FAISS index to {index_path}")
+
+    add_to_merged_index(list(stores.values()), embedding)
+
+
+def index_files(chunks_by_file: dict[Path, list[Document]], embedding: Embeddings, save: bool = True) -> dict[Path, FAISS]:
+    """Build one FAISS index per source file, embedding the chunks of all files in one batch.
+
+    Each chunk is tagged with its source filename. Optionally saves the indexes and updates the merged index once.
+    """
+    docs_by_file = {path: [Document(page_content=chunk.page_content, metadata={"source": path.name}) for chunk in chunks] for path, chunks in chunks_by_file.items()}
+    stores = build_vectorstores(docs_by_file, embedding)
+
+    # Save the FAISS indexes locally if requested
+    if save:
+        save_vectorstores(stores, embedding)
+
+    return stores
+
+
+def merge_vectorstores(target: FAISS, source: FAISS) -> None:
+    """Add every document of `source` to `target`.
+
+    HNSW indexes don't support `FAISS.merge_from`, so the stored vectors are reconstructed and re-added instead.
+    """
+    # Skip documents the target already holds (e.g. a shard merged while building the merged index)
+    existing_ids = set(target.index_to_docstore_id.values())
+    positions = [i for i in range(source.index.ntotal) if source.index_to_docstore_id[i] not in existing_ids]
+    if not positions:
+        return
+
+    ids = [source.index_to_docstore_id[i] for i in positions]
+    docs = [source.docstore.search(doc_id) for doc_id in ids]
+    vectors = [source.index.reconstruct(i) for i in positions]
+    target.add_embeddings(
+        [(doc.page_content, vector.tolist()) for doc, vector in zip(docs, vectors, strict=True)],
+        metadatas=[doc.metadata for doc in docs],
+        ids=ids,
+    )
+
+
+def load_and_merge_shards(base_dir: Path, embedding: Embeddings) -> FAISS | None:
+    """Load every per-file FAISS index in `base_dir` and merge them into a single fresh store."""
+    base_store: FAISS | None = None
+
+    for path in sorted(base_dir.glob("index_faiss_*")):
+        if not path.is_dir():
+            continue
+        print(f"Loading index from: {path}")
+        store = load_vectorstore(path, embedding)
+        if base_store is None:
+            # Start from an empty index so older flat L2 shards are rebuilt with the current index type
+            base_store = create_vectorstore(embedding, store.index.d)
+        merge_vectorstores(base_store, store)
+
+    return base_store
+
+
+def _replace_merged_index(store: FAISS, merged_path: Path) -> None:
+    """Save the merged index without truncating the files other sessions have memory-mapped.
+
+    The store is written to a temporary directory, then each file is renamed over the old one: mappings of
+    the old index.faiss keep reading its unlinked inode. The docstore is replaced first; the merged index
+    only grows, so a newer docstore still covers every position of an older index. Call with the lock held.
+    """
+    merged_path.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=merged_path.parent, prefix=f".{merged_path.name}-") as tmp_dir:
+        store.save_local(tmp_dir)
+        for file_name in ("index.pkl", "index.faiss"):
+            (Path(tmp_dir) / file_name).replace(merged_path / file_name)  # atomic rename, like os.replace
+
+
+def add_to_merged_index(stores: list[FAISS], embedding: Embeddings) -> None:
+    """Fold newly built per-file indexes into the merged index on disk, loading and saving it only once.
+
+    The merged index is built from all per-file indexes the first time, then only extended with new documents.
+    """
+    merged_path = get_merged_index_path()
+    with _MERGED_INDEX_LOCK:
+        # First run: saved per-file indexes are already part of the shards (already merged ids are skipped below)
+        first_run = not (merged_path / "index.faiss").exists()
+        merged = (load_and_merge_shards(Config.paths.INDEX_DIR, embedding) or create_vectorstore(embedding, stores[0].index.d)) if first_run else load_vectorstore(merged_path, embedding)
+
+        for store in stores:
+            merge_vectorstores(merged, store)
+        _replace_merged_index(merged, merged_path)
+    print(f"Updated merged FAISS index at {merged_path}")
+
+
+def ensure_merged_index(base_dir: Path, embedding: Embeddings) -> Path:
+    """Build the merged index from the per-file indexes in `base_dir` if it does not exist yet, and return its directory.
+
+    Runs under the same lock as `add_to_merged_index`, so it cannot race an upload writing the merged index.
+    """
+    merged_path = base_dir / Config.paths.MERGED_INDEX_NAME
+    with _MERGED_INDEX_LOCK:
+        if not (merged_path / "index.faiss").exists():
+            # One-time migration: merge existing per-file indexes and persist the result
+            base_store = load_and_merge_shards(base_dir, embedding)
+            if base_store is None:
+                msg = f"No FAISS indexes found in {base_dir}"
+                raise FileNotFoundError(msg)
+
+            _replace_merged_index(base_store, merged_path)
+            print(f"Saved merged index to: {merged_path}")
+
+    return merged_path
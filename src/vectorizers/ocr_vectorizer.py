@@ -1,12 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from langchain.docstore.document import Document
-from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_community.vectorstores import FAISS
 
 from configs.config import Config
+from src.utils.file_listing import list_files
 from src.utils.ocr_content_extraction import extract_image_content
 from src.utils.text_splitter import split_text_into_chunks
+from src.vectorizers._shared import get_embedding
+from src.vectorizers.index_store import get_index_path, index_files
 
 
 class OCRVectorizerAgent:
@@ -14,10 +17,7 @@ class OCRVectorizerAgent:
 
     def __init__(self) -> None:
         """Initialize the OCRVectorizerAgent with embeddings and optional index."""
-        self.embedding = HuggingFaceEmbeddings(
-            model_name=Config.models.EMBEDDING_MODEL_NAME,
-            model_kwargs=Config.models.EMBEDDING_MODEL_KWARGS,
-        )
+        self.embedding = get_embedding()
 
         # Path to a general FAISS index (optional, not used per image)
         self.index_path = str(Config.paths.INDEX_DIR / "faiss_index")
@@ -37,19 +37,25 @@ class OCRVectorizerAgent:
         text, _ = extract_image_content(img_path, img_path.name)
         return split_text_into_chunks(text)
 
+    def index_documents(self, img_path: Path, chunks: list[Document], save: bool = True) -> FAISS:
+        """Build a FAISS index from an image's chunks. Optionally saves it to disk and adds it to the merged index."""
+        return index_files({img_path: chunks}, self.embedding, save=save)[img_path]
+
+    def process_images_batched(self, img_paths: list[Path], batch_size: int = 8) -> dict[Path, list[Document]]:
+        """Process several images concurrently, returning the chunks extracted from each one.
+
+        Tesseract runs as a separate process, so up to `batch_size` images are OCR'd at the same time.
+        """
+        with ThreadPoolExecutor(max_workers=max(1, min(batch_size, len(img_paths)))) as executor:
+            return dict(zip(img_paths, executor.map(self.process_image, img_paths), strict=True))
+
     def process_all_images_in_directory(self, directory: Path, save: bool = True) -> None:
         """Process all image files in a directory, indexing each file separately. Optionally saves each FAISS index to disk."""
-        for img_file in directory.glob("*.*"):
-            if img_file.suffix.lower() not in [".png", ".jpg", ".jpeg", ".tiff"]:
-                continue
-
+        chunks_by_file: dict[Path, list[Document]] = {}
+        for img_file in list_files(directory, (".png", ".jpg", ".jpeg", ".tiff")):
             try:
-                # Normalize and define the name for this FAISS index
-                index_name = img_file.stem.replace(" ", "_").lower()
-                index_path = Config.paths.INDEX_DIR / f"index_faiss_{index_name}"
-
                 # Skip if index already exists
-                if index_path.exists():
+                if get_index_path(img_file).exists():
                     print(f"Index already exists for {img_file.name}. Skipping.")
                     continue
 
@@ -59,15 +65,14 @@ class OCRVectorizerAgent:
                     print(f"No content extracted from {img_file.name}. Skipping.")
                     continue
 
-                docs_with_metadata = [Document(page_content=chunk.page_content, metadata={"source": img_file.name}) for chunk in chunks]
-
-                # Create FAISS index from chunks
-                vectorstore = FAISS.from_documents(docs_with_metadata, self.embedding)
-
-                # Save the index locally
-                if save:
-                    vectorstore.save_local(index_path)
-                    print(f"Saved FAISS index to {index_path}")
+                chunks_by_file[img_file] = chunks
 
             except Exception as exc:
                 print(f"Error processing {img_file.name}: {exc}")
+
+        # Embed the chunks of all new files in one batch
+        if chunks_by_file:
+            try:
+                index_files(chunks_by_file, self.embedding, save=save)
+            except Exception as exc:
+                print(f"Error indexing {len(chunks_by_file)} files from {directory}: {exc}")
@@ -1,12 +1,14 @@
 from pathlib import Path
 
 from langchain.docstore.document import Document
-from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_community.vectorstores import FAISS
 
 from configs.config import Config
+from src.utils.file_listing import list_files
 from src.utils.pdf_content_extraction import extract_pdf_content
 from src.utils.text_splitter import split_text_into_chunks
+from src.vectorizers._shared import get_embedding
+from src.vectorizers.index_store import get_index_path, index_files
 
 
 class PDFVectorizerAgent:
@@ -14,10 +16,7 @@ class PDFVectorizerAgent:
 
     def __init__(self) -> None:
         """Initialize the PDFVectorizerAgent with embeddings and optional index."""
-        self.embedding = HuggingFaceEmbeddings(
-            model_name=Config.models.EMBEDDING_MODEL_NAME,
-            model_kwargs=Config.models.EMBEDDING_MODEL_KWARGS,
-        )
+        self.embedding = get_embedding()
 
         # Path to the base FAISS index
         self.index_path = str(Config.paths.INDEX_DIR / "faiss_index")
@@ -37,16 +36,17 @@ class PDFVectorizerAgent:
         text, _ = extract_pdf_content(pdf_path, pdf_path.name)
         return split_text_into_chunks(text)
 
+    def index_documents(self, pdf_path: Path, chunks: list[Document], save: bool = True) -> FAISS:
+        """Build a FAISS index from a PDF's chunks. Optionally saves it to disk and adds it to the merged index."""
+        return index_files({pdf_path: chunks}, self.embedding, save=save)[pdf_path]
+
     def process_all_pdfs_in_directory(self, directory: Path, save: bool = True) -> None:
         """Process all PDF files in a directory. Each file is indexed separately. Optionally saves each index to disk to avoid reprocessing."""
-        for pdf_file in directory.glob("*.pdf"):
+        chunks_by_file: dict[Path, list[Document]] = {}
+        for pdf_file in list_files(directory, (".pdf",)):
             try:
-                # Normalize and define the name for this FAISS index
-                index_name = pdf_file.stem.replace(" ", "_").lower()
-                index_path = Config.paths.INDEX_DIR / f"index_faiss_{index_name}"
-
                 # Skip processing if the index already exists
-                if index_path.exists():
+                if get_index_path(pdf_file).exists():
                     print(f"Index already exists for {pdf_file.name}. Skipping.")
                     continue
 
@@ -56,15 +56,14 @@ class PDFVectorizerAgent:
                     print(f"No content extracted from {pdf_file.name}. Skipping.")
                     continue
 
-                docs_with_metadata = [Document(page_content=chunk.page_content, metadata={"source": pdf_file.name}) for chunk in chunks]
-
-                # Create a FAISS vectorstore from the chunks with metadata
-                vectorstore = FAISS.from_documents(docs_with_metadata, self.embedding)
-
-                # Save the FAISS index locally if requested
-                if save:
-                    vectorstore.save_local(index_path)
-                    print(f"Saved FAISS index to {index_path}")
+                chunks_by_file[pdf_file] = chunks
 
             except Exception as exc:
                 print(f"Error processing {pdf_file.name}: {exc}")
+
+        # Embed the chunks of all new files in one batch
+        if chunks_by_file:
+            try:
+                index_files(chunks_by_file, self.embedding, save=save)
+            except Exception as exc:
+                print(f"Error indexing {len(chunks_by_file)} files from {directory}: {exc}")
@@ -1,11 +1,12 @@
 from pathlib import Path
 
 from langchain.docstore.document import Document
-from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_community.vectorstores import FAISS
 
-from configs.config import Config
+from src.utils.file_listing import list_files
 from src.utils.text_splitter import split_text_into_chunks
+from src.vectorizers._shared import get_embedding
+from src.vectorizers.index_store import get_index_path, index_files
 
 
 class YBVectorizerAgent:
@@ -13,10 +14,7 @@ class YBVectorizerAgent:
 
     def __init__(self) -> None:
         """Initialize the YouTube transcript vectorizer with embedding model."""
-        self.embedding = HuggingFaceEmbeddings(
-            model_name=Config.models.EMBEDDING_MODEL_NAME,
-            model_kwargs=Config.models.EMBEDDING_MODEL_KWARGS,
-        )
+        self.embedding = get_embedding()
 
     def process_yb_video(self, yb_text_file: str) -> list[Document]:
         """Read and chunk a single YouTube transcript file."""
@@ -29,15 +27,16 @@ class YBVectorizerAgent:
 
         return split_text_into_chunks(yb_text)
 
+    def index_documents(self, yb_txt_path: Path, chunks: list[Document], save: bool = True) -> FAISS:
+        """Build a FAISS index from a transcript's chunks. Optionally saves it to disk and adds it to the merged index."""
+        return index_files({yb_txt_path: chunks}, self.embedding, save=save)[yb_txt_path]
+
     def process_all_txt_in_directory(self, directory: Path, save: bool = True) -> None:
         """Process all `.txt` transcript files in the directory. Each transcript is indexed separately with FAISS."""
-        for yb_txt_file in directory.glob("*.txt"):
+        chunks_by_file: dict[Path, list[Document]] = {}
+        for yb_txt_file in list_files(directory, (".txt",)):
             try:
-                # Normalize and define the name for this FAISS index
-                index_name = yb_txt_file.stem.replace(" ", "_").lower()
-                index_path = Config.paths.INDEX_DIR / f"index_faiss_{index_name}"
-
-                if index_path.exists():
+                if get_index_path(yb_txt_file).exists():
                     print(f"Index already exists for {yb_txt_file.name}. Skipping.")
                     continue
 
@@ -47,16 +46,14 @@ class YBVectorizerAgent:
                     print(f"No content extracted from {yb_txt_file.name}. Skipping.")
                     continue
 
-                # Convert chunks to Documents with metadata
-                docs_with_metadata = [Document(page_content=chunk.page_content, metadata={"source": yb_txt_file.name}) for chunk in chunks]
-
-                # Create and save FAISS index
-                vectorstore = FAISS.from_documents(docs_with_metadata, self.embedding)
-
-                # Save the FAISS index locally if requested
-                if save:
-                    vectorstore.save_local(index_path)
-                    print(f"Saved FAISS index to {index_path}")
+                chunks_by_file[yb_txt_file] = chunks
 
             except Exception as exc:
                 print(f"Error processing {yb_txt_file.name}: {exc}")
+
+        # Embed the chunks of all new files in one batch
+        if chunks_by_file:
+            try:
+                index_files(chunks_by_file, self.embedding, save=save)
+            except Exception as exc:
+                print(f"Error indexing {len(chunks_by_file)} files from {directory}: {exc}")